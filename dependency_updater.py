@@ -6,6 +6,7 @@ import asyncio
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List, Optional
 
 import aiohttp
@@ -18,17 +19,33 @@ load_dotenv()
 
 
 class DependencyUpdater:
-    def __init__(self, base_url: str, token: str):
+    def __init__(self, base_url: str, token: str, session: Optional[aiohttp.ClientSession] = None):
+        """
+        Args:
+            base_url: Home Assistant URL
+            token: Long-lived access token
+            session: Optional shared session (keep-alive across calls); owned and closed by the caller
+        """
         self.base_url = base_url.rstrip("/")
         self.token = token
         self.headers = {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
         }
+        self.session = session
+
+    @asynccontextmanager
+    async def _session(self):
+        """Use the shared session if one was injected, otherwise a temporary one"""
+        if self.session is not None and not self.session.closed:
+            yield self.session
+        else:
+            async with aiohttp.ClientSession() as session:
+                yield session
 
     async def get_states(self) -> List[Dict]:
         """Hole alle States"""
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             url = f"{self.base_url}/api/states"
             async with session.get(url, headers=self.headers) as response:
                 return await response.json()
@@ -38,7 +55,7 @@ class DependencyUpdater:
         """Hole Scene Konfiguration"""
         url = f"{self.base_url}/api/config/scene/config/{scene_numeric_id}"
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             async with session.get(url, headers=self.headers) as response:
                 if response.status == 200:
                     return await response.json()
@@ -50,7 +67,7 @@ class DependencyUpdater:
         """Aktualisiere Scene Konfiguration"""
         url = f"{self.base_url}/api/config/scene/config/{scene_numeric_id}"
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             async with session.post(url, headers=self.headers, json=config) as response:
                 if response.status == 200:
                     result = await response.json()
@@ -89,7 +106,7 @@ class DependencyUpdater:
         script_name = script_id.replace("script.", "")
         url = f"{self.base_url}/api/config/script/config/{script_name}"
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             async with session.get(url, headers=self.headers) as response:
                 if response.status == 200:
                     return await response.json()
@@ -102,7 +119,7 @@ class DependencyUpdater:
         script_name = script_id.replace("script.", "")
         url = f"{self.base_url}/api/config/script/config/{script_name}"
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             async with session.post(url, headers=self.headers, json=config) as response:
                 if response.status == 200:
                     result = await response.json()
@@ -177,7 +194,7 @@ class DependencyUpdater:
         """Hole Automation Konfiguration"""
         url = f"{self.base_url}/api/config/automation/config/{automation_numeric_id}"
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             async with session.get(url, headers=self.headers) as response:
                 if response.status == 200:
                     return await response.json()
@@ -192,7 +209,7 @@ class DependencyUpdater:
         """Aktualisiere Automation Konfiguration"""
         url = f"{self.base_url}/api/config/automation/config/{automation_numeric_id}"
 
-        async with aiohttp.ClientSession() as session:
+        async with self._session() as session:
             async with session.post(url, headers=self.headers, json=config) as response:
                 if response.status == 200:
                     result = await response.json()
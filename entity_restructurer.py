@@ -24,9 +24,9 @@ except ImportError:
     HierarchyManager = None
 
 try:
-    from type_mappings import TypeMappings
+    from type_mappings import get_shared_type_mappings
 except ImportError:
-    TypeMappings = None
+    get_shared_type_mappings = None
 
 logger = logging.getLogger(__name__)
 
@@ -62,14 +62,21 @@ class EntityRestructurer:
         self.devices = {}
         self.areas = {}
         self.entities = {}
+        # area_id -> area name, rebuilt by load_structure
+        self.area_names: Dict[str, str] = {}
+        # device_id -> integration domains from its identifiers, rebuilt by load_structure
+        self.device_integrations: Dict[str, List[str]] = {}
+        # Lookup indexes over self.entities, rebuilt by load_structure
+        self._entities_by_registry_id: Dict[str, str] = {}
+        self._entities_by_device: Dict[str, List[str]] = {}
         self.naming_overrides = naming_overrides or NamingOverrides()
         self.language = language
 
         # Initialize type mappings for translations
         if type_mappings:
             self.type_mappings = type_mappings
-        elif TypeMappings:
-            self.type_mappings = TypeMappings()
+        elif get_shared_type_mappings:
+            self.type_mappings = get_shared_type_mappings()
         else:
             self.type_mappings = None
 
@@ -155,6 +162,9 @@ class EntityRestructurer:
             self.areas = {}
             self.devices = {}
             self.entities = {}
+            self.area_names = {}
+            self.device_integrations = {}
+            self._build_entity_indexes()
             return
 
         try:
@@ -168,6 +178,7 @@ class EntityRestructurer:
             if response.get("success"):
                 areas_data = response.get("result", [])
                 self.areas = {area["area_id"]: area for area in areas_data}
+                self.area_names = {area_id: area.get("name", "") for area_id, area in self.areas.items()}
                 logger.info(f"Loaded {len(self.areas)} areas via WebSocket")
             else:
                 logger.error(f"Failed to load areas: {response}")
@@ -186,6 +197,9 @@ class EntityRestructurer:
             if response.get("success"):
                 devices_data = response.get("result", [])
                 self.devices = {device["id"]: device for device in devices_data}
+                self.device_integrations = {
+                    device_id: self._extract_integrations(device) for device_id, device in self.devices.items()
+                }
                 logger.info(f"Loaded {len(self.devices)} devices via WebSocket")
             else:
                 logger.error(f"Failed to load devices: {response}")
@@ -220,10 +234,80 @@ class EntityRestructurer:
             logger.error(f"Failed to load entity registry: {e}")
             self.entities = {}
 
+        self._build_entity_indexes()
+
         # Populate hierarchy manager for cascade updates
         if self.hierarchy_manager:
             self._populate_hierarchy_manager()
 
+    @staticmethod
+    def _extract_integrations(device: Dict) -> List[str]:
+        """
+        Extract the integration domains from a device's identifiers.
+
+        identifiers is like [["homekit_controller", "xxx"], ["zha", "yyy"]]; some
+        use "homekit_controller:accessory-id", where only the domain part counts.
+        """
+        integrations = []
+        for identifier in device.get("identifiers", []):
+            if isinstance(identifier, (list, tuple)) and len(identifier) >= 1:
+                domain = identifier[0]
+                if ":" in domain:
+                    domain = domain.split(":")[0]
+                if domain and domain not in integrations:
+                    integrations.append(domain)
+        return integrations
+
+    def _build_entity_indexes(self) -> None:
+        """Index the loaded entities by registry ID and by device."""
+        self._entities_by_registry_id = {}
+        self._entities_by_device = {}
+        for entity_id, entity in self.entities.items():
+            registry_id = entity.get("id")
+            if registry_id:
+                self._entities_by_registry_id[registry_id] = entity_id
+            device_id = entity.get("device_id")
+            if device_id:
+                self._entities_by_device.setdefault(device_id, []).append(entity_id)
+
+    def get_entity_id_by_registry_id(self, registry_id: str) -> Optional[str]:
+        """Return the entity_id for an entity registry ID, if loaded."""
+        return self._entities_by_registry_id.get(registry_id)
+
+    def get_device_entity_ids(self, device_id: str) -> List[str]:
+        """Return the entity_ids belonging to a device, in registry order."""
+        return self._entities_by_device.get(device_id, [])
+
+    def apply_device_rename(
+        self, device_id: str, new_name: str, entity_renames: List[Tuple[str, str, str]]
+    ) -> None:
+        """
+        Apply a completed device rename to the loaded structure in memory.
+
+        Saves a full load_structure round trip after renaming a device.
+
+        Args:
+            device_id: The renamed device
+            new_name: The new device name (stored as name_by_user, like HA does)
+            entity_renames: (old_entity_id, new_entity_id, new_friendly_name) for
+                every entity that was successfully renamed in HA
+        """
+        if device_id in self.devices:
+            self.devices[device_id]["name_by_user"] = new_name
+
+        for old_entity_id, new_entity_id, new_friendly_name in entity_renames:
+            entity = self.entities.pop(old_entity_id, None)
+            if entity is None:
+                continue
+            entity["entity_id"] = new_entity_id
+            entity["name"] = new_friendly_name
+            self.entities[new_entity_id] = entity
+
+        self._build_entity_indexes()
+
+        if self.hierarchy_manager:
+            self._populate_hierarchy_manager()
+
     def _populate_hierarchy_manager(self) -> None:
         """Populate the hierarchy manager with loaded data."""
         if not self.hierarchy_manager:
@@ -549,11 +633,8 @@ class EntityRestructurer:
         # If learning is enabled and we have type_mappings
         if learn_mapping and self.type_mappings:
             # Find the entity to get its device_class
-            entity = None
-            for eid, edata in self.entities.items():
-                if edata.get("id") == registry_id:
-                    entity = edata
-                    break
+            entity_id = self.get_entity_id_by_registry_id(registry_id)
+            entity = self.entities.get(entity_id) if entity_id else None
 
             if entity:
                 device_class = entity.get("device_class") or entity.get("original_device_class")
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from typing import Any, Dict, List
 
 import aiohttp
@@ -15,9 +17,10 @@ class HomeAssistantClient:
             "Content-Type": "application/json",
         }
         self.session = None
+        self._session_loop = None
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -25,26 +28,40 @@ class HomeAssistantClient:
             await self.session.close()
 
     async def connect(self):
-        if not self.session:
+        """Open a persistent session bound to the running event loop (reconnects if it was closed)"""
+        if not self.session or self.session.closed:
             self.session = aiohttp.ClientSession()
+            self._session_loop = asyncio.get_running_loop()
 
     async def disconnect(self):
         if self.session:
             await self.session.close()
             self.session = None
+            self._session_loop = None
+
+    @asynccontextmanager
+    async def _request_session(self):
+        """Yield the persistent session when it belongs to the running loop, otherwise a temporary one.
+
+        aiohttp sessions cannot be shared across event loops, so callers on a
+        short-lived per-request loop still get their own session.
+        """
+        if self.session and not self.session.closed and self._session_loop is asyncio.get_running_loop():
+            yield self.session
+        else:
+            async with aiohttp.ClientSession() as session:
+                yield session
 
     async def get_states(self) -> List[Dict[str, Any]]:
         url = f"{self.base_url}/api/states"
-        # Create temporary session for this request
-        async with aiohttp.ClientSession() as session:
+        async with self._request_session() as session:
             async with session.get(url, headers=self.headers) as response:
                 response.raise_for_status()
                 return await response.json()
 
     async def get_entity(self, entity_id: str) -> Dict[str, Any]:
         url = f"{self.base_url}/api/states/{entity_id}"
-        # Create temporary session for this request
-        async with aiohttp.ClientSession() as session:
+        async with self._request_session() as session:
             async with session.get(url, headers=self.headers) as response:
                 response.raise_for_status()
                 return await response.json()
@@ -58,16 +75,14 @@ class HomeAssistantClient:
 
     async def call_service(self, domain: str, service: str, data: Dict = None) -> Any:
         url = f"{self.base_url}/api/services/{domain}/{service}"
-        # Create temporary session for this request
-        async with aiohttp.ClientSession() as session:
+        async with self._request_session() as session:
             async with session.post(url, headers=self.headers, json=data or {}) as response:
                 response.raise_for_status()
                 return await response.json()
 
     async def get_config(self) -> Dict[str, Any]:
         url = f"{self.base_url}/api/config"
-        # Create temporary session for this request
-        async with aiohttp.ClientSession() as session:
+        async with self._request_session() as session:
             async with session.get(url, headers=self.headers) as response:
                 response.raise_for_status()
                 return await response.json()
@@ -75,8 +90,7 @@ class HomeAssistantClient:
     async def check_api_access(self) -> bool:
         try:
             url = f"{self.base_url}/api/"
-            # Create temporary session for this request
-            async with aiohttp.ClientSession() as session:
+            async with self._request_session() as session:
                 async with session.get(url, headers=self.headers) as response:
                     data = await response.json()
                     return data.get("message") == "API running."
@@ -37,6 +37,11 @@ class HomeAssistantWebSocket:
         if self.websocket:
             await self.websocket.close()
 
+    @property
+    def is_connected(self) -> bool:
+        """True while the underlying connection is open (state name works across websockets versions)"""
+        return self.websocket is not None and getattr(self.websocket.state, "name", None) == "OPEN"
+
     async def _send_message(self, message: Dict[str, Any]) -> int:
         if "id" not in message and message["type"] != "auth":
             message["id"] = self.message_id
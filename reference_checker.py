@@ -7,7 +7,7 @@ import json
 import logging
 import os
 import re
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, replace
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 import aiohttp
@@ -157,14 +157,40 @@ class ReferenceChecker:
         self._existing_entities: Optional[Set[str]] = None
         self._entity_details: Optional[Dict[str, Dict]] = None
         self._broken_refs_cache: Optional[List[BrokenReference]] = None
+        # missing_entity_id -> broken references, built from _broken_refs_cache on demand
+        self._by_missing: Optional[Dict[str, List[BrokenReference]]] = None
 
     def invalidate_cache(self):
         """Invalidiert den Cache."""
         self._broken_refs_cache = None
+        self._by_missing = None
         self._existing_entities = None
         self._entity_details = None
         logger.info("Reference checker cache invalidated")
 
+    def patch_rename(self, old_id: str, new_id: str):
+        """Überträgt eine Umbenennung in den Cache, ohne neu zu scannen.
+
+        Assumes the DependencyUpdater already rewrote references to old_id, so
+        they stay valid, while references to new_id are no longer broken.
+        """
+        if old_id == new_id:
+            return
+        if self._existing_entities is not None:
+            self._existing_entities.discard(old_id)
+            self._existing_entities.add(new_id)
+        if self._entity_details is not None:
+            details = self._entity_details.pop(old_id, None)
+            if details is not None:
+                self._entity_details[new_id] = {**details, "entity_id": new_id, "domain": new_id.split(".")[0]}
+        if self._broken_refs_cache is not None:
+            self._broken_refs_cache = [
+                replace(ref, config_id=new_id) if ref.config_id == old_id else ref
+                for ref in self._broken_refs_cache
+                if ref.missing_entity_id != new_id
+            ]
+            self._by_missing = None
+
     async def get_states(self) -> List[Dict]:
         """Hole alle States von Home Assistant."""
         async with aiohttp.ClientSession() as session:
@@ -466,8 +492,19 @@ class ReferenceChecker:
 
         logger.info(f"Found {len(broken_refs)} broken references")
         self._broken_refs_cache = broken_refs
+        self._by_missing = None
         return broken_refs
 
+    async def refs_for_missing(self, missing_entity_id: str) -> List[BrokenReference]:
+        """Alle (gecachten) verwaisten Referenzen auf eine fehlende Entity."""
+        broken_refs = await self.scan_all_references(use_cache=True)
+        if self._by_missing is None:
+            by_missing: Dict[str, List[BrokenReference]] = {}
+            for ref in broken_refs:
+                by_missing.setdefault(ref.missing_entity_id, []).append(ref)
+            self._by_missing = by_missing
+        return self._by_missing.get(missing_entity_id, [])
+
     def _levenshtein_distance(self, s1: str, s2: str) -> int:
         """Berechnet die Levenshtein-Distanz zwischen zwei Strings."""
         if len(s1) < len(s2):
@@ -14,10 +14,16 @@ Example resolution for "battery" with German user preference:
 3. Check system_defaults["device_class"]["battery"]["de"] -> "Batterie"
 4. Fallback -> "Battery"
 """
+import heapq
 import json
 import logging
+import sys
+import threading
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +106,35 @@ DEFAULT_SYSTEM_MAPPINGS = {
 }
 
 
+def _intern_keys(data: Any) -> Any:
+    """Recursively intern dict keys so language codes and type keys are shared objects."""
+    if isinstance(data, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: _intern_keys(v) for k, v in data.items()}
+    return data
+
+
+DEFAULT_SYSTEM_MAPPINGS = _intern_keys(DEFAULT_SYSTEM_MAPPINGS)
+
+# Entity ID substrings that hint at an integration, checked in priority order
+INTEGRATION_HINTS = (
+    ("zigbee2mqtt", "zigbee2mqtt"),
+    ("0x", "zigbee2mqtt"),
+    ("hue", "hue"),
+    ("esphome", "esphome"),
+    ("tasmota", "tasmota"),
+)
+
+
+@lru_cache(maxsize=4096)
+def _detect_integration(entity_id: str) -> Optional[str]:
+    """Match an entity ID against INTEGRATION_HINTS (memoized per entity ID)."""
+    entity_id_lower = entity_id.lower()
+    for hint, integration in INTEGRATION_HINTS:
+        if hint in entity_id_lower:
+            return integration
+    return None
+
+
 class TypeMappings:
     """
     Manages entity type translations with multiple priority layers.
@@ -109,8 +144,23 @@ class TypeMappings:
     2. Integration defaults - from system_mappings.json or embedded defaults
     3. System device_class defaults - from system_mappings.json or embedded
     4. Fallback - capitalize the key
+
+    User mappings are copy-on-write: readers use the current read-only view
+    without locking, writers build a new dict under ``_lock`` and swap it in.
     """
 
+    __slots__ = (
+        "system_mappings_path",
+        "user_mappings_path",
+        "system_mappings",
+        "user_mappings",
+        "_device_class",
+        "_integration_defaults",
+        "_any_integration_flat",
+        "_sorted_system_types",
+        "_lock",
+    )
+
     def __init__(
         self,
         system_mappings_path: Optional[str] = None,
@@ -126,8 +176,10 @@ class TypeMappings:
         self.system_mappings_path = Path(system_mappings_path) if system_mappings_path else None
         self.user_mappings_path = Path(user_mappings_path)
 
+        self._lock = threading.RLock()
         self.system_mappings = self._load_system_mappings()
-        self.user_mappings = self._load_user_mappings()
+        self._index_system_mappings()
+        self.user_mappings: Mapping[str, str] = MappingProxyType(self._load_user_mappings())
 
     def _load_system_mappings(self) -> Dict[str, Any]:
         """Load system mappings from file or use embedded defaults."""
@@ -135,14 +187,36 @@ class TypeMappings:
             try:
                 with open(self.system_mappings_path, "r", encoding="utf-8") as f:
                     data = json.load(f)
-                    logger.info(f"System mappings loaded from {self.system_mappings_path}")
-                    return data
+                    logger.info("System mappings loaded from %s", self.system_mappings_path)
+                    return _intern_keys(data)
             except (json.JSONDecodeError, IOError) as e:
-                logger.error(f"Error loading system mappings: {e}")
+                logger.error("Error loading system mappings: %s", e)
 
         logger.info("Using embedded system mappings")
         return DEFAULT_SYSTEM_MAPPINGS
 
+    def _index_system_mappings(self) -> None:
+        """Cache the system mapping sections and lookup tables used by every lookup."""
+        self._device_class = self.system_mappings.get("device_class") or {}
+        self._integration_defaults = self.system_mappings.get("integration_defaults") or {}
+
+        # type_key -> lang_mapping from the first integration that defines it
+        self._any_integration_flat = {}
+        for mappings in self._integration_defaults.values():
+            for type_key, lang_mapping in mappings.items():
+                self._any_integration_flat.setdefault(type_key, lang_mapping)
+
+        # (type_key, lang_mapping, source) for every system type, sorted by key
+        system_types = {}
+        for type_key, lang_mapping in self._device_class.items():
+            system_types.setdefault(type_key, (lang_mapping, "device_class"))
+        for integration, mappings in self._integration_defaults.items():
+            for type_key, lang_mapping in mappings.items():
+                system_types.setdefault(type_key, (lang_mapping, f"integration:{integration}"))
+        self._sorted_system_types = [
+            (type_key, lang_mapping, source) for type_key, (lang_mapping, source) in sorted(system_types.items())
+        ]
+
     def _load_user_mappings(self) -> Dict[str, str]:
         """Load user mappings from file."""
         if self.user_mappings_path.exists():
@@ -151,7 +225,7 @@ class TypeMappings:
                     data = json.load(f)
                     return data.get("user_mappings", {})
             except (json.JSONDecodeError, IOError) as e:
-                logger.error(f"Error loading user mappings: {e}")
+                logger.error("Error loading user mappings: %s", e)
 
         return {}
 
@@ -161,13 +235,13 @@ class TypeMappings:
             # Ensure directory exists
             self.user_mappings_path.parent.mkdir(parents=True, exist_ok=True)
 
-            data = {"user_mappings": self.user_mappings}
+            data = {"user_mappings": dict(self.user_mappings)}
             with open(self.user_mappings_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
 
-            logger.info(f"User mappings saved: {len(self.user_mappings)} entries")
+            logger.info("User mappings saved: %d entries", len(self.user_mappings))
         except Exception as e:
-            logger.error(f"Error saving user mappings: {e}")
+            logger.error("Error saving user mappings: %s", e)
 
     def get_translation(
         self,
@@ -201,18 +275,20 @@ class TypeMappings:
         type_key_lower = type_key.lower()
 
         # 1. Check user mappings (highest priority)
-        if type_key_lower in self.user_mappings:
-            return self.user_mappings[type_key_lower]
+        # Single read: a concurrent set_user_mapping may swap the mapping in between
+        translation = self.user_mappings.get(type_key_lower)
+        if translation is not None:
+            return translation
 
         # 2. Check integration-specific defaults
         if integration:
-            integration_mappings = self.system_mappings.get("integration_defaults", {}).get(integration, {})
+            integration_mappings = self._integration_defaults.get(integration, {})
             if type_key_lower in integration_mappings:
                 lang_mapping = integration_mappings[type_key_lower]
                 return lang_mapping.get(language, lang_mapping.get("en", type_key.title()))
 
         # 3. Check system device_class defaults
-        device_class_mappings = self.system_mappings.get("device_class", {})
+        device_class_mappings = self._device_class
         if type_key_lower in device_class_mappings:
             lang_mapping = device_class_mappings[type_key_lower]
             return lang_mapping.get(language, lang_mapping.get("en", type_key.title()))
@@ -236,9 +312,12 @@ class TypeMappings:
             translation: The user's preferred translation (e.g., "Batterieladung")
         """
         type_key_lower = type_key.lower()
-        self.user_mappings[type_key_lower] = translation
-        self._save_user_mappings()
-        logger.info(f"User mapping set: {type_key_lower} -> {translation}")
+        with self._lock:
+            new_mappings = dict(self.user_mappings)
+            new_mappings[type_key_lower] = translation
+            self.user_mappings = MappingProxyType(new_mappings)
+            self._save_user_mappings()
+        logger.info("User mapping set: %s -> %s", type_key_lower, translation)
 
     def remove_user_mapping(self, type_key: str) -> bool:
         """
@@ -251,12 +330,15 @@ class TypeMappings:
             True if removed, False if not found
         """
         type_key_lower = type_key.lower()
-        if type_key_lower in self.user_mappings:
-            del self.user_mappings[type_key_lower]
+        with self._lock:
+            if type_key_lower not in self.user_mappings:
+                return False
+            new_mappings = dict(self.user_mappings)
+            del new_mappings[type_key_lower]
+            self.user_mappings = MappingProxyType(new_mappings)
             self._save_user_mappings()
-            logger.info(f"User mapping removed: {type_key_lower}")
-            return True
-        return False
+        logger.info("User mapping removed: %s", type_key_lower)
+        return True
 
     def get_user_mapping(self, type_key: str) -> Optional[str]:
         """Get user mapping for a type key if it exists."""
@@ -264,7 +346,7 @@ class TypeMappings:
 
     def get_all_user_mappings(self) -> Dict[str, str]:
         """Get all user mappings."""
-        return self.user_mappings.copy()
+        return dict(self.user_mappings)
 
     def get_all_known_types(self, language: str = "en") -> List[Dict[str, Any]]:
         """
@@ -281,46 +363,48 @@ class TypeMappings:
         Returns:
             List of type info dicts
         """
-        all_types = []
-        seen_keys = set()
-
-        # Collect from device_class mappings
-        for type_key, lang_mapping in self.system_mappings.get("device_class", {}).items():
-            if type_key not in seen_keys:
-                seen_keys.add(type_key)
-                all_types.append({
-                    "key": type_key,
-                    "system_default": lang_mapping.get(language, lang_mapping.get("en", type_key.title())),
-                    "user_mapping": self.user_mappings.get(type_key),
-                    "source": "device_class",
-                })
-
-        # Collect from integration defaults
-        for integration, mappings in self.system_mappings.get("integration_defaults", {}).items():
-            for type_key, lang_mapping in mappings.items():
-                if type_key not in seen_keys:
-                    seen_keys.add(type_key)
-                    all_types.append({
-                        "key": type_key,
-                        "system_default": lang_mapping.get(language, lang_mapping.get("en", type_key.title())),
-                        "user_mapping": self.user_mappings.get(type_key),
-                        "source": f"integration:{integration}",
-                    })
-
-        # Add user mappings not in system
-        for type_key, translation in self.user_mappings.items():
-            if type_key not in seen_keys:
-                all_types.append({
-                    "key": type_key,
-                    "system_default": None,
-                    "user_mapping": translation,
-                    "source": "user_custom",
-                })
-
-        # Sort by key
-        all_types.sort(key=lambda x: x["key"])
-
-        return all_types
+        return list(self.iter_known_types(language))
+
+    def iter_known_types(self, language: str = "en") -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all known type keys in key order.
+
+        Merges the presorted system types with the user's custom keys instead
+        of collecting and sorting everything on each call.
+
+        Args:
+            language: Target language for system defaults
+
+        Yields:
+            Type info dicts (same shape as get_all_known_types)
+        """
+        user_mappings = self.user_mappings
+        device_class = self._device_class
+        any_integration = self._any_integration_flat
+
+        system_types = (
+            {
+                "key": type_key,
+                "system_default": lang_mapping.get(language, lang_mapping.get("en", type_key.title())),
+                "user_mapping": user_mappings.get(type_key),
+                "source": source,
+            }
+            for type_key, lang_mapping, source in self._sorted_system_types
+        )
+
+        # User mappings not in system
+        user_custom_types = (
+            {
+                "key": type_key,
+                "system_default": None,
+                "user_mapping": user_mappings[type_key],
+                "source": "user_custom",
+            }
+            for type_key in sorted(user_mappings)
+            if type_key not in device_class and type_key not in any_integration
+        )
+
+        return heapq.merge(system_types, user_custom_types, key=itemgetter("key"))
 
     def detect_integration(self, entity_id: str) -> Optional[str]:
         """
@@ -332,19 +416,7 @@ class TypeMappings:
         Returns:
             Integration name if detected, None otherwise
         """
-        entity_id_lower = entity_id.lower()
-
-        # Common patterns
-        if "zigbee2mqtt" in entity_id_lower or "0x" in entity_id_lower:
-            return "zigbee2mqtt"
-        if "hue" in entity_id_lower:
-            return "hue"
-        if "esphome" in entity_id_lower:
-            return "esphome"
-        if "tasmota" in entity_id_lower:
-            return "tasmota"
-
-        return None
+        return _detect_integration(entity_id)
 
     def get_system_default(self, type_key: str, language: str = "en") -> Optional[str]:
         """
@@ -359,19 +431,14 @@ class TypeMappings:
         """
         type_key_lower = type_key.lower()
 
-        # Check device_class
-        device_class_mappings = self.system_mappings.get("device_class", {})
-        if type_key_lower in device_class_mappings:
-            lang_mapping = device_class_mappings[type_key_lower]
-            return lang_mapping.get(language, lang_mapping.get("en"))
+        # Check device_class, then the first integration defining the key
+        lang_mapping = self._device_class.get(type_key_lower)
+        if lang_mapping is None:
+            lang_mapping = self._any_integration_flat.get(type_key_lower)
+        if lang_mapping is None:
+            return None
 
-        # Check all integrations
-        for mappings in self.system_mappings.get("integration_defaults", {}).values():
-            if type_key_lower in mappings:
-                lang_mapping = mappings[type_key_lower]
-                return lang_mapping.get(language, lang_mapping.get("en"))
-
-        return None
+        return lang_mapping.get(language, lang_mapping.get("en"))
 
     def has_user_mapping(self, type_key: str) -> bool:
         """Check if a user mapping exists for the type key."""
@@ -379,6 +446,39 @@ class TypeMappings:
 
     def reload(self) -> None:
         """Reload mappings from files."""
-        self.system_mappings = self._load_system_mappings()
-        self.user_mappings = self._load_user_mappings()
+        with self._lock:
+            self.system_mappings = self._load_system_mappings()
+            self._index_system_mappings()
+            self.user_mappings = MappingProxyType(self._load_user_mappings())
         logger.info("Type mappings reloaded")
+
+
+# Shared instances keyed by (system_mappings_path, user_mappings_path)
+_shared_instances: Dict[Tuple[Optional[str], str], TypeMappings] = {}
+_shared_instances_lock = threading.Lock()
+
+
+def get_shared_type_mappings(
+    system_mappings_path: Optional[str] = None,
+    user_mappings_path: str = "/data/user_type_mappings.json",
+) -> TypeMappings:
+    """
+    Get the process-wide TypeMappings instance for the given mapping files.
+
+    All callers asking for the same files share one instance, so the mappings
+    are loaded from disk and held in memory only once per process.
+
+    Args:
+        system_mappings_path: Path to system mappings JSON (optional, uses embedded defaults)
+        user_mappings_path: Path to user mappings JSON
+
+    Returns:
+        The shared TypeMappings instance
+    """
+    key = (system_mappings_path, user_mappings_path)
+    with _shared_instances_lock:
+        instance = _shared_instances.get(key)
+        if instance is None:
+            instance = TypeMappings(system_mappings_path, user_mappings_path)
+            _shared_instances[key] = instance
+        return instance
@@ -3,17 +3,24 @@
 Web UI für Home Assistant Entity Renamer - Add-on Version
 """
 import asyncio
-import html
+import atexit
+import concurrent.futures
+import contextvars
+import hashlib
 import json
 import logging
 import os
 import re
+import threading
 import time
-import unicodedata
-from typing import Optional
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import aiohttp
-from flask import Flask, jsonify, make_response, render_template, request, send_from_directory
+from flask import Flask, Response, jsonify, make_response, render_template, request, send_from_directory
 from flask_cors import CORS
 from werkzeug.middleware.proxy_fix import ProxyFix
 
@@ -26,7 +33,31 @@ from entity_restructurer import EntityRestructurer
 from ha_client import HomeAssistantClient
 from ha_websocket import HomeAssistantWebSocket
 from naming_overrides import NamingOverrides
-from type_mappings import TypeMappings
+from type_mappings import get_shared_type_mappings
+
+# orjson is optional - fall back to the stdlib encoder if it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# uvloop is optional - used for the background event loop when installed
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# flask-compress is optional - compresses JSON responses when installed
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# waitress is optional - production WSGI server, falls back to the Werkzeug dev server
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
 
 # Don't load .env in Add-on mode - use environment variables from Supervisor
 # load_dotenv()
@@ -34,10 +65,274 @@ from type_mappings import TypeMappings
 # Language-independent constant for entities without area assignment
 UNASSIGNED_AREA = "__unassigned__"
 
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment settings, read once at startup instead of on every request"""
+
+    ha_url: Optional[str]
+    ha_token: Optional[str]
+    ws_url: Optional[str]
+    enable_disabled_entities: bool
+    # Upper bound for entity renames running at the same time (each uses its own connection)
+    rename_concurrency: int
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        ha_url = os.getenv("HA_URL")
+        try:
+            rename_concurrency = max(1, int(os.getenv("HA_RENAME_CONCURRENCY", "8")))
+        except ValueError:
+            # Invalid value in the add-on options - keep the default instead of failing at import
+            rename_concurrency = 8
+        return cls(
+            ha_url=ha_url,
+            ha_token=os.getenv("HA_TOKEN"),
+            ws_url=(
+                ha_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket" if ha_url else None
+            ),
+            enable_disabled_entities=os.getenv("ENABLE_DISABLED_ENTITIES", "false").lower() == "true",
+            rename_concurrency=rename_concurrency,
+        )
+
+
+SETTINGS = Settings.from_env()
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one concurrent rename task, merged into the response after gather"""
+
+    bucket: Optional[str] = None  # "success" | "failed" | "skipped"
+    payload: Optional[Dict] = None
+    warning: Optional[Dict] = None  # dependency_warnings entry
+
+    def record(self, bucket: str, payload: Dict):
+        self.bucket = bucket
+        self.payload = payload
+
+    def warn(self, warning: Dict):
+        self.warning = warning
+
+    def merge_into(self, results: Dict[str, List[Dict]]):
+        if self.bucket is not None:
+            results[self.bucket].append(self.payload)
+        if self.warning is not None:
+            results["dependency_warnings"].append(self.warning)
+
+
 app = Flask(__name__, static_folder="static", static_url_path="/static")
 # Support for Ingress proxy headers
 app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 CORS(app)
+# jsonify: keep insertion order and send umlauts etc. as UTF-8 instead of \uXXXX escapes
+app.json.sort_keys = False
+app.json.ensure_ascii = False
+
+if Compress is not None:
+    # JSON only: Server-Sent Events must reach the browser as they are produced.
+    # Streamed JSON responses are compressed chunk by chunk and keep streaming (Flask-Compress >= 1.22).
+    app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+    app.config["COMPRESS_LEVEL"] = 4
+    Compress(app)
+
+
+# One long-lived event loop for all async handlers instead of a new loop per request
+_event_loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+threading.Thread(target=_event_loop.run_forever, name="async-handlers", daemon=True).start()
+
+# Worker threads for CPU-bound scans, so they don't stall the shared event loop
+_scan_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="dependency-scan")
+
+
+def run_async(coro):
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+
+    The caller's context is copied into the task, so Flask's request and
+    app context stay available inside the coroutine.
+    """
+    ctx = contextvars.copy_context()
+    result = concurrent.futures.Future()
+
+    def _on_done(task):
+        if task.cancelled():
+            result.cancel()
+        elif task.exception() is not None:
+            result.set_exception(task.exception())
+        else:
+            result.set_result(task.result())
+
+    def _start():
+        _event_loop.create_task(coro, context=ctx).add_done_callback(_on_done)
+
+    _event_loop.call_soon_threadsafe(_start)
+    return result.result()
+
+
+# Flush threshold for streamed JSON responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Upper bound for broken-reference fixes running at the same time
+REFERENCE_FIX_CONCURRENCY = 20
+
+# Above this many renames a full broken-reference rescan beats patching the cache entry by entry
+REFERENCE_PATCH_LIMIT = 50
+
+# How long a fetched /api/states list is shared between requests (seconds)
+STATES_CACHE_TTL = 5.0
+
+# Cache-busting token for static assets: fixed per process, so assets stay cached until a restart/deploy
+ASSET_VERSION = str(int(time.time()))
+
+# Idle, authenticated WebSocket connections keyed by (ws_url, token). The HA WebSocket
+# client is not multiplexed, so a connection is handed to one request at a time.
+_ws_pool: Dict[Tuple[str, str], List[HomeAssistantWebSocket]] = {}
+
+
+async def acquire_ws(ws_url: str, token: str) -> HomeAssistantWebSocket:
+    """Take an open connection from the pool, or connect a new one"""
+    idle = _ws_pool.setdefault((ws_url, token), [])
+    while idle:
+        ws = idle.pop()
+        if ws.is_connected:
+            return ws
+        await ws.disconnect()
+    ws = HomeAssistantWebSocket(ws_url, token)
+    await ws.connect()
+    return ws
+
+
+async def release_ws(ws: HomeAssistantWebSocket):
+    """Return a connection to the pool; closed connections are dropped"""
+    if ws.is_connected:
+        _ws_pool.setdefault((ws.url, ws.token), []).append(ws)
+    else:
+        await ws.disconnect()
+
+
+# Shared HTTP session for REST calls made from the background loop (keeps connections alive)
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session, creating it on first use"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        # Keep connections to HA alive between requests; DNS rarely changes for the add-on host
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+    return _http_session
+
+
+async def _close_shared_connections():
+    for idle in _ws_pool.values():
+        while idle:
+            await idle.pop().disconnect()
+    if _http_session is not None:
+        await _http_session.close()
+    if renamer_state["client"]:
+        await renamer_state["client"].disconnect()
+
+
+atexit.register(lambda: run_async(_close_shared_connections()))
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """Serialize a large JSON payload with orjson when available (jsonify otherwise)"""
+    if orjson is None:
+        return make_response(jsonify(payload), status)
+    return json_bytes_response(orjson.dumps(payload), status)
+
+
+def json_bytes_response(body: bytes, status: int = 200) -> Response:
+    """Send already serialized JSON as is (no per-chunk re-encoding pass by Werkzeug)"""
+    return Response(body, status=status, mimetype="application/json", direct_passthrough=True)
+
+
+def stream_json_response(payload: Dict, status: int = 200) -> Response:
+    """Stream a JSON object, serializing list/iterator values item by item.
+
+    Iterator values are consumed into lists before the response starts, so
+    errors while building the items still reach the caller's error handling
+    instead of ending a 200 with truncated JSON. The Python objects are
+    therefore held in full; only the serialized output is flushed in ~64 KB
+    chunks instead of being encoded as one buffer.
+    """
+    payload = {key: list(value) if isinstance(value, Iterator) else value for key, value in payload.items()}
+
+    def generate():
+        buffer = bytearray(b"{")
+        try:
+            for index, (key, value) in enumerate(payload.items()):
+                if index:
+                    buffer += b","
+                buffer += json_bytes(key) + b":"
+                if isinstance(value, (list, tuple)):
+                    buffer += b"["
+                    for item_index, item in enumerate(value):
+                        if item_index:
+                            buffer += b","
+                        buffer += json_bytes(item)
+                        if len(buffer) >= STREAM_CHUNK_SIZE:
+                            yield bytes(buffer)
+                            buffer.clear()
+                    buffer += b"]"
+                else:
+                    buffer += json_bytes(value)
+                if len(buffer) >= STREAM_CHUNK_SIZE:
+                    yield bytes(buffer)
+                    buffer.clear()
+        except Exception:
+            # Status and headers are already sent - abort the connection so the client
+            # sees an incomplete transfer instead of a complete-looking response
+            logger.exception("Fehler beim Streamen der JSON-Antwort")
+            raise
+        buffer += b"}"
+        yield bytes(buffer)
+
+    # The generator already yields bytes, so Werkzeug can hand it to the server unchanged
+    return Response(generate(), status=status, mimetype="application/json", direct_passthrough=True)
+
+
+def event_stream_response(events) -> Response:
+    """Relay an async generator of JSON events to the client as Server-Sent Events.
+
+    Events are pulled one at a time from the shared event loop, so each one is
+    sent as soon as it is produced instead of after the whole operation.
+    """
+    end = object()
+
+    def generate():
+        try:
+            while True:
+                event = asyncio.run_coroutine_threadsafe(anext(events, end), _event_loop).result()
+                if event is end:
+                    break
+                yield b"data: " + json_bytes(event) + b"\n\n"
+        finally:
+            # Also runs when the client disconnects early
+            asyncio.run_coroutine_threadsafe(events.aclose(), _event_loop).result()
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        direct_passthrough=True,
+        # Ingress proxies must not buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def json_bytes(payload) -> bytes:
+    """Serialize to JSON bytes for responses, streams and dependency scans (orjson when available)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass
+    return json.dumps(payload).encode()
+
 
 # Setup logging to both console and file
 log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -58,9 +353,16 @@ renamer_state = {
     "restructurer": None,
     "areas": {},
     "entities_by_area": {},
+    # Entity IDs flagged is_orphan in entities_by_area, rebuilt together with it
+    "orphan_entities": frozenset(),
     "proposed_changes": {},
+    # Bumped whenever area/entity data is reloaded or modified; keys the preview cache
+    "data_version": 0,
+    "preview_cache": {},
+    # (states, member entity -> scenes/groups listing it); built lazily by the dependencies endpoint
+    "member_index": None,
     "naming_overrides": NamingOverrides("/data/naming_overrides.json"),
-    "type_mappings": TypeMappings(user_mappings_path="/data/user_type_mappings.json"),
+    "type_mappings": get_shared_type_mappings(user_mappings_path="/data/user_type_mappings.json"),
 }
 
 
@@ -79,6 +381,26 @@ ENTITY_ID_PATTERN = re.compile(r"^[a-z][a-z0-9_]*\.[a-z0-9_]+$")
 # Valid characters for registry IDs (typically alphanumeric with some special chars)
 REGISTRY_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
 
+# Umlaut folding for matching area IDs against entity IDs
+UMLAUT_TABLE = str.maketrans({"ü": "u", "ö": "o", "ä": "a"})
+
+# Delete table for control characters (Unicode category Cc: C0, DEL, C1) except newline and tab
+CONTROL_CHAR_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7F, 0xA0)], None)
+del CONTROL_CHAR_TABLE[ord("\n")], CONTROL_CHAR_TABLE[ord("\t")]
+
+# Characters that sanitize_name has to act on: HTML specials, plus "=" for event handlers
+HTML_SPECIAL_PATTERN = re.compile(r"[&<>\"'=]")
+
+# Script blocks and inline event handlers stripped from names
+SCRIPT_TAG_PATTERN = re.compile(r"<script[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+EVENT_HANDLER_PATTERN = re.compile(r"on\w+\s*=", re.IGNORECASE)
+
+# Characters not allowed anywhere in an entity ID
+ENTITY_ID_STRIP_PATTERN = re.compile(r"[^a-z0-9_.]")
+
+# Same replacements as html.escape(value, quote=True), applied in a single pass
+HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
 
 def sanitize_string(value: str, max_length: int = MAX_NAME_LENGTH) -> str:
     """
@@ -92,18 +414,17 @@ def sanitize_string(value: str, max_length: int = MAX_NAME_LENGTH) -> str:
         return None
     if not isinstance(value, str):
         value = str(value)
+    return _sanitize_string_str(value, max_length)
+
 
+@lru_cache(maxsize=512)
+def _sanitize_string_str(value: str, max_length: int) -> str:
+    """Cached string part of sanitize_string (pure function of its inputs)"""
     # Strip whitespace
     value = value.strip()
 
-    # Remove control characters (keep newlines and tabs for multi-line text)
-    value = "".join(
-        char for char in value
-        if unicodedata.category(char) != "Cc" or char in "\n\t"
-    )
-
-    # Remove null bytes and other dangerous characters
-    value = value.replace("\x00", "")
+    # Remove control characters incl. null bytes (keep newlines and tabs for multi-line text)
+    value = value.translate(CONTROL_CHAR_TABLE)
 
     # Limit length
     value = value[:max_length]
@@ -118,16 +439,28 @@ def sanitize_name(value: str, max_length: int = MAX_NAME_LENGTH) -> str:
     - Escape HTML to prevent XSS
     - Remove script tags and event handlers
     """
-    value = sanitize_string(value, max_length)
     if value is None:
         return None
+    if not isinstance(value, str):
+        value = str(value)
+    return _sanitize_name_str(value, max_length)
+
+
+@lru_cache(maxsize=512)
+def _sanitize_name_str(value: str, max_length: int) -> str:
+    """Cached string part of sanitize_name (pure function of its inputs)"""
+    value = _sanitize_string_str(value, max_length)
+
+    # Fast path: plain names contain nothing to strip or escape
+    if not HTML_SPECIAL_PATTERN.search(value):
+        return value
 
     # Remove any script tags or event handlers (case insensitive)
-    value = re.sub(r"<script[^>]*>.*?</script>", "", value, flags=re.IGNORECASE | re.DOTALL)
-    value = re.sub(r"on\w+\s*=", "", value, flags=re.IGNORECASE)
+    value = SCRIPT_TAG_PATTERN.sub("", value)
+    value = EVENT_HANDLER_PATTERN.sub("", value)
 
     # Escape HTML entities to prevent XSS
-    value = html.escape(value, quote=True)
+    value = value.translate(HTML_ESCAPE_TABLE)
 
     return value
 
@@ -141,7 +474,12 @@ def sanitize_entity_id(value: str) -> str:
         return None
     if not isinstance(value, str):
         return None
+    return _sanitize_entity_id_str(value)
+
 
+@lru_cache(maxsize=4096)
+def _sanitize_entity_id_str(value: str) -> str:
+    """Cached string part of sanitize_entity_id (pure function of its input)"""
     # Strip and lowercase
     value = value.strip().lower()
 
@@ -152,7 +490,7 @@ def sanitize_entity_id(value: str) -> str:
     value = value.replace(" ", "_").replace("-", "_")
 
     # Remove any characters that aren't valid
-    value = re.sub(r"[^a-z0-9_.]", "", value)
+    value = ENTITY_ID_STRIP_PATTERN.sub("", value)
 
     # Validate format
     if not ENTITY_ID_PATTERN.match(value):
@@ -169,7 +507,12 @@ def sanitize_registry_id(value: str) -> str:
         return None
     if not isinstance(value, str):
         return None
+    return _sanitize_registry_id_str(value)
 
+
+@lru_cache(maxsize=4096)
+def _sanitize_registry_id_str(value: str) -> str:
+    """Cached string part of sanitize_registry_id (pure function of its input)"""
     # Strip whitespace
     value = value.strip()
 
@@ -191,50 +534,129 @@ def validate_json_input(data: dict, required_fields: list = None) -> tuple:
     if not isinstance(data, dict):
         return False, "Invalid JSON input"
 
-    if required_fields:
+    # Only build the list of missing fields on the failure path
+    if required_fields and not all(f in data for f in required_fields):
         missing = [f for f in required_fields if f not in data]
-        if missing:
-            return False, f"Missing required fields: {', '.join(missing)}"
+        return False, f"Missing required fields: {', '.join(missing)}"
 
     return True, None
 
 
+_client_lock = threading.Lock()
+
+
 async def init_client():
     """Initialize the Home Assistant client and restructurer."""
-    if not renamer_state["client"]:
-        # In Add-on mode, use Supervisor API
-        base_url = os.getenv("HA_URL", "http://supervisor/core")
-        token = os.getenv("HA_TOKEN", os.getenv("SUPERVISOR_TOKEN"))
-        logger.info("ALPHA VERSION - Entity Manager Add-on")
-        logger.info(f"Connecting to Home Assistant at {base_url}")
-        renamer_state["client"] = HomeAssistantClient(base_url, token)
-        renamer_state["restructurer"] = EntityRestructurer(
-            renamer_state["client"],
-            renamer_state["naming_overrides"],
-            type_mappings=renamer_state["type_mappings"],
-        )
-    return renamer_state["client"]
+    # Flask serves requests from several threads; build the singleton only once
+    with _client_lock:
+        if not renamer_state["client"]:
+            # In Add-on mode, use Supervisor API
+            base_url = os.getenv("HA_URL", "http://supervisor/core")
+            token = os.getenv("HA_TOKEN", os.getenv("SUPERVISOR_TOKEN"))
+            logger.info("ALPHA VERSION - Entity Manager Add-on")
+            logger.info(f"Connecting to Home Assistant at {base_url}")
+            renamer_state["client"] = HomeAssistantClient(base_url, token)
+            renamer_state["restructurer"] = EntityRestructurer(
+                renamer_state["client"],
+                renamer_state["naming_overrides"],
+                type_mappings=renamer_state["type_mappings"],
+            )
+    client = renamer_state["client"]
+    if asyncio.get_running_loop() is _event_loop:
+        # Keep a warm keep-alive session on the shared loop; reopens it if it was closed
+        await client.connect()
+    return client
+
+
+def bump_data_version():
+    """Mark cached previews as stale after a reload or any modifying request"""
+    renamer_state["data_version"] += 1
+    renamer_state["preview_cache"].clear()
+    renamer_state["member_index"] = None
+    invalidate_states_cache()
+
+
+# Short-lived /api/states cache: expiry, in-flight/finished fetch and the derived lookup
+_states_cache = {"expires": 0.0, "future": None, "lookup": None}
+
+
+def invalidate_states_cache():
+    """Force the next get_states_cached() call to refetch"""
+    _states_cache["expires"] = 0.0
+
+
+async def get_states_cached() -> List[Dict]:
+    """Return all states, shared for STATES_CACHE_TTL seconds.
+
+    Concurrent callers await the same fetch. The list is shared - don't mutate it.
+    """
+    now = time.monotonic()
+    future = _states_cache["future"]
+    if future is None or now >= _states_cache["expires"] or future.get_loop() is not asyncio.get_running_loop():
+        client = await init_client()
+        future = asyncio.ensure_future(client.get_states())
+        _states_cache.update(expires=now + STATES_CACHE_TTL, future=future, lookup=None)
+    try:
+        return await asyncio.shield(future)
+    except Exception:
+        # Don't keep serving a failed fetch
+        if _states_cache["future"] is future:
+            invalidate_states_cache()
+        raise
+
+
+async def get_state_lookup_cached() -> Dict[str, Dict]:
+    """Return entity_id -> state for the cached states list"""
+    states = await get_states_cached()
+    lookup = _states_cache["lookup"]
+    if lookup is None or lookup[0] is not states:
+        lookup = (states, {s["entity_id"]: s for s in states})
+        _states_cache["lookup"] = lookup
+    return lookup[1]
+
+
+def build_member_index(states: List[Dict]) -> Dict[str, List[str]]:
+    """Map each entity to the scenes and groups that list it in their entity_id attribute"""
+    member_index = defaultdict(list)
+    for state in states:
+        state_id = state["entity_id"]
+        if state_id.startswith(("scene.", "group.")):
+            members = state.get("attributes", {}).get("entity_id", [])
+            if isinstance(members, list):
+                for member in dict.fromkeys(members):
+                    member_index[member].append(state_id)
+    return member_index
+
+
+# POST endpoints that only read (request body too large or structured for a GET)
+READ_ONLY_POST_ENDPOINTS = ("preview_changes", "get_dependencies_batch")
+
+
+@app.after_request
+def invalidate_preview_cache(response):
+    """Every modifying request (rename, override, mapping edit, ...) invalidates cached previews"""
+    if request.method in ("POST", "DELETE") and request.endpoint not in READ_ONLY_POST_ENDPOINTS:
+        bump_data_version()
+    return response
 
 
 async def load_areas_and_entities():
     """Lade alle Areas und ihre Entities"""
     try:
         client = await init_client()
-        logger.info(f"Client initialized: {client.base_url}")
+        logger.info("Client initialized: %s", client.base_url)
 
         # Create WebSocket connection for structure data
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+        token = SETTINGS.ha_token
+        ws_url = SETTINGS.ws_url
 
         # Lade States
         logger.info("Loading states from Home Assistant...")
         states = await client.get_states()
-        logger.info(f"Loaded {len(states)} states")
+        logger.info("Loaded %s states", len(states))
 
         # Now connect WebSocket for structure data
-        ws = HomeAssistantWebSocket(ws_url, token)
-        await ws.connect()
+        ws = await acquire_ws(ws_url, token)
 
         try:
             # Load structure (Areas, Devices, etc) via WebSocket
@@ -244,30 +666,35 @@ async def load_areas_and_entities():
             # Ensure that areas were loaded
             areas_count = len(renamer_state["restructurer"].areas)
             devices_count = len(renamer_state["restructurer"].devices)
-            logger.info(f"Loaded {areas_count} areas, {devices_count} devices")
+            logger.info("Loaded %s areas, %s devices", areas_count, devices_count)
 
             if areas_count == 0:
                 logger.warning("No areas loaded, using fallback mode")
         finally:
-            await ws.disconnect()
+            await release_ws(ws)
+
+        # Bind registries once (load_structure() above assigns fresh dicts)
+        restructurer = renamer_state["restructurer"]
+        devices = restructurer.devices
+        entities_reg = restructurer.entities
 
         # Organize entities by area
         areas_dict = {}
         entities_by_area = {}
 
         # Erstelle Area-Dict
-        for area_id, area in renamer_state["restructurer"].areas.items():
+        for area_id, area in restructurer.areas.items():
             area_name = area.get("name", "Unbekannt")
             areas_dict[area_id] = area_name
-            entities_by_area[area_name] = {"domains": {}}
-            logger.debug(f"Added area: {area_name} (ID: {area_id})")
+            entities_by_area[area_name] = {"domains": defaultdict(list)}
+            logger.debug("Added area: %s (ID: %s)", area_name, area_id)
 
         # Add "Not assigned" (using language-independent constant)
-        entities_by_area[UNASSIGNED_AREA] = {"domains": {}}
+        entities_by_area[UNASSIGNED_AREA] = {"domains": defaultdict(list)}
 
         # Create device-entity mapping from the devices
         device_entities = {}
-        for device_id, device in renamer_state["restructurer"].devices.items():
+        for device_id, device in devices.items():
             # Many devices have their entity IDs in the identifiers
             for identifier in device.get("identifiers", []):
                 if isinstance(identifier, list) and len(identifier) > 1:
@@ -279,21 +706,41 @@ async def load_areas_and_entities():
             if device.get("name"):
                 device_entities[device["name"]] = device_id
 
+        # Only names of devices with a known area can resolve an entity
+        device_area_by_name = {}
+        for name, device_id in device_entities.items():
+            device = devices.get(device_id)
+            if isinstance(name, str) and device and device.get("area_id") and device["area_id"] in areas_dict:
+                device_area_by_name[name] = areas_dict[device["area_id"]]
+
+        # Normalized area keys for the entity ID fallback below. Entity IDs contain a single
+        # dot, so ".{area_key}_" can only match directly after the domain; the alternation
+        # keeps areas_dict order, so the first matching area still wins.
+        normalized_areas = {}
+        for area_id, name in areas_dict.items():
+            normalized_areas.setdefault(area_id.lower().translate(UMLAUT_TABLE), name)
+        area_key_pattern = None
+        if normalized_areas:
+            area_key_pattern = re.compile(r"\.(" + "|".join(map(re.escape, normalized_areas)) + r")_")
+
         # Process all entities
-        entities_by_area_count = {}
+        entities_by_area_count = defaultdict(int)
+        # Entity IDs that have a state, so the registry pass below can skip them
+        entities_with_state = set()
+        orphan_entities = set()
         for state in states:
             entity_id = state["entity_id"]
-            domain = entity_id.split(".")[0]
+            domain, _, object_id = entity_id.partition(".")
             area_name = UNASSIGNED_AREA
 
             # Try to find area from various sources
 
             # 1. From Entity Registry (if loaded)
-            entity_reg = renamer_state["restructurer"].entities.get(entity_id, {})
+            entity_reg = entities_reg.get(entity_id, {})
             if entity_reg:
                 device_id = entity_reg.get("device_id")
-                if device_id and device_id in renamer_state["restructurer"].devices:
-                    device = renamer_state["restructurer"].devices[device_id]
+                if device_id and device_id in devices:
+                    device = devices[device_id]
                     if device.get("area_id") and device["area_id"] in areas_dict:
                         area_name = areas_dict[device["area_id"]]
                 elif entity_reg.get("area_id") and entity_reg["area_id"] in areas_dict:
@@ -310,44 +757,36 @@ async def load_areas_and_entities():
                 # Device ID in attributes
                 elif "device_id" in attributes:
                     device_id = attributes["device_id"]
-                    if device_id in renamer_state["restructurer"].devices:
-                        device = renamer_state["restructurer"].devices[device_id]
+                    if device_id in devices:
+                        device = devices[device_id]
                         if device.get("area_id") and device["area_id"] in areas_dict:
                             area_name = areas_dict[device["area_id"]]
 
             # 3. Try to find the device via entity name
-            if area_name == UNASSIGNED_AREA:
-                # Extract possible device parts from entity ID
-                entity_parts = entity_id.split(".")[-1].split("_")
-
-                # Search for device match
-                for i in range(len(entity_parts), 0, -1):
-                    potential_device_name = "_".join(entity_parts[:i])
-                    if potential_device_name in device_entities:
-                        device_id = device_entities[potential_device_name]
-                        device = renamer_state["restructurer"].devices.get(device_id)
-                        if device and device.get("area_id") and device["area_id"] in areas_dict:
-                            area_name = areas_dict[device["area_id"]]
-                            break
-
-            # 4. Try to recognize the room from entity ID (Fallback)
-            if area_name == UNASSIGNED_AREA:
-                entity_lower = entity_id.lower()
-                for area_id, name in areas_dict.items():
-                    # Normalize area names for comparison
-                    area_key = area_id.lower().replace("ü", "u").replace("ö", "o").replace("ä", "a")
-                    if f".{area_key}_" in entity_lower or entity_lower.startswith(f"{domain}.{area_key}_"):
-                        area_name = name
+            if area_name == UNASSIGNED_AREA and device_area_by_name:
+                # Longest "_"-delimited prefix of the object ID first, one dict lookup each
+                end = len(object_id)
+                while end >= 0:
+                    device_area = device_area_by_name.get(object_id[:end])
+                    if device_area is not None:
+                        area_name = device_area
                         break
+                    end = object_id.rfind("_", 0, end)
 
-            # Add entity to the corresponding area and domain
-            if domain not in entities_by_area[area_name]["domains"]:
-                entities_by_area[area_name]["domains"][domain] = []
+            # 4. Try to recognize the room from entity ID (Fallback)
+            if area_name == UNASSIGNED_AREA and area_key_pattern:
+                # Anchored at the domain separator: one attempt instead of a scan
+                match = area_key_pattern.match(entity_id.lower(), len(domain))
+                if match:
+                    area_name = normalized_areas[match.group(1)]
 
             # Check if entity is orphan (restored from storage but no longer provided by integration)
             attributes = state.get("attributes", {})
             is_orphan = attributes.get("restored", False) == True
+            if is_orphan:
+                orphan_entities.add(entity_id)
 
+            # Add entity to the corresponding area and domain
             entities_by_area[area_name]["domains"][domain].append(
                 {
                     "entity_id": entity_id,
@@ -356,23 +795,17 @@ async def load_areas_and_entities():
                     "is_orphan": is_orphan,
                 }
             )
+            entities_with_state.add(entity_id)
 
             # Count for debug
-            entities_by_area_count[area_name] = entities_by_area_count.get(area_name, 0) + 1
+            entities_by_area_count[area_name] += 1
 
         # Now process disabled AND orphan entities from entity registry
         logger.info("Processing disabled and orphan entities from registry...")
         disabled_count = 0
         orphan_count = 0
 
-        # Build set of entity_ids that have state (for faster lookup)
-        entities_with_state = set()
-        for area_data in entities_by_area.values():
-            for domain_entities in area_data["domains"].values():
-                for e in domain_entities:
-                    entities_with_state.add(e["entity_id"])
-
-        for entity_id, entity_reg in renamer_state["restructurer"].entities.items():
+        for entity_id, entity_reg in entities_reg.items():
             # Skip if already processed (entities with state)
             if entity_id in entities_with_state:
                 continue
@@ -385,23 +818,21 @@ async def load_areas_and_entities():
                 disabled_count += 1
             else:
                 orphan_count += 1
+                orphan_entities.add(entity_id)
 
-            domain = entity_id.split(".")[0]
+            domain = entity_id.partition(".")[0]
             area_name = UNASSIGNED_AREA
 
             # Find area from device or entity registry
             device_id = entity_reg.get("device_id")
-            if device_id and device_id in renamer_state["restructurer"].devices:
-                device = renamer_state["restructurer"].devices[device_id]
+            if device_id and device_id in devices:
+                device = devices[device_id]
                 if device.get("area_id") and device["area_id"] in areas_dict:
                     area_name = areas_dict[device["area_id"]]
             elif entity_reg.get("area_id") and entity_reg["area_id"] in areas_dict:
                 area_name = areas_dict[entity_reg["area_id"]]
 
             # Add to entities_by_area
-            if domain not in entities_by_area[area_name]["domains"]:
-                entities_by_area[area_name]["domains"][domain] = []
-
             entities_by_area[area_name]["domains"][domain].append(
                 {
                     "entity_id": entity_id,
@@ -413,33 +844,35 @@ async def load_areas_and_entities():
             )
 
             # Update count
-            entities_by_area_count[area_name] = entities_by_area_count.get(area_name, 0) + 1
+            entities_by_area_count[area_name] += 1
 
-        logger.info(f"Added {disabled_count} disabled entities from registry")
-        logger.info(f"Added {orphan_count} orphan entities from registry")
+        logger.info("Added %s disabled entities from registry", disabled_count)
+        logger.info("Added %s orphan entities from registry", orphan_count)
 
         # Debug Output
         logger.info("Entity distribution by area:")
         for area, count in entities_by_area_count.items():
             if count > 0:
-                logger.info(f"  {area}: {count} entities")
+                logger.info("  %s: %s entities", area, count)
 
         renamer_state["areas"] = areas_dict
         renamer_state["entities_by_area"] = entities_by_area
+        renamer_state["orphan_entities"] = frozenset(orphan_entities)
+        bump_data_version()
 
-        logger.info(f"Organization complete: {len(entities_by_area)} areas with entities")
+        logger.info("Organization complete: %s areas with entities", len(entities_by_area))
         return entities_by_area
 
     except Exception as e:
-        logger.error(f"Error in load_areas_and_entities: {str(e)}", exc_info=True)
+        logger.error("Error in load_areas_and_entities: %s", e, exc_info=True)
         raise
 
 
 @app.route("/")
 def index():
     """Hauptseite"""
-    # Use timestamp for cache busting
-    version = str(int(time.time()))
+    # Per-process token for cache busting
+    version = ASSET_VERSION
     response = make_response(render_template("index.html", version=version))
     # Prevent browser from caching the HTML page
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
@@ -476,9 +909,9 @@ def serve_translations(filename):
     return send_from_directory("translations/ui", filename)
 
 
-@app.route("/api/languages")
-def get_available_languages():
-    """Return available UI languages based on translation files"""
+@lru_cache(maxsize=1)
+def _load_available_languages():
+    """Scan translation files once; the set of UI languages is fixed for the process lifetime"""
     import glob
 
     # Language display names
@@ -505,7 +938,13 @@ def get_available_languages():
         name = language_names.get(code, code.upper())
         languages.append({"code": code, "name": name})
 
-    return jsonify({"languages": languages})
+    return languages
+
+
+@app.route("/api/languages")
+def get_available_languages():
+    """Return available UI languages based on translation files"""
+    return json_response({"languages": _load_available_languages()})
 
 
 @app.route("/test/css-info")
@@ -534,13 +973,7 @@ def test_css_info():
 @app.route("/api/areas")
 def get_areas():
     """Gibt alle Areas mit ihren Domains zurück"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_get_areas_async())
-    finally:
-        loop.close()
+    return run_async(_get_areas_async())
 
 
 async def _get_areas_async():
@@ -549,7 +982,7 @@ async def _get_areas_async():
         logger.info("Loading areas and entities...")
         await load_areas_and_entities()
 
-        logger.info(f"Found {len(renamer_state['entities_by_area'])} areas")
+        logger.info("Found %s areas", len(renamer_state["entities_by_area"]))
 
         # Prepare data for frontend
         areas_data = []
@@ -562,40 +995,33 @@ async def _get_areas_async():
         for area_name, area_data in renamer_state["entities_by_area"].items():
             if area_data["domains"]:  # Nur Areas mit Entities
                 area_id = area_name_to_id.get(area_name, None)
+                entity_count = sum(len(entities) for entities in area_data["domains"].values())
 
                 areas_data.append(
                     {
                         "name": area_name,
                         "display_name": area_name,
                         "area_id": area_id,
-                        "domains": sorted(list(area_data["domains"].keys())),
-                        "entity_count": sum(len(entities) for entities in area_data["domains"].values()),
+                        "domains": sorted(area_data["domains"]),
+                        "entity_count": entity_count,
                     }
                 )
-                logger.debug(
-                    f"Area '{area_name}': {len(area_data['domains'])} domains, {sum(len(entities) for entities in area_data['domains'].values())} entities"
-                )
+                logger.debug("Area '%s': %s domains, %s entities", area_name, len(area_data["domains"]), entity_count)
 
         # Sortiere nach Name
         areas_data.sort(key=lambda x: x["name"])
 
-        logger.info(f"Returning {len(areas_data)} areas with entities")
-        return jsonify(areas_data)
+        logger.info("Returning %s areas with entities", len(areas_data))
+        return json_response(areas_data)
     except Exception as e:
-        logger.error(f"Error in get_areas: {str(e)}", exc_info=True)
+        logger.error("Error in get_areas: %s", e, exc_info=True)
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/preview", methods=["POST"])
 def preview_changes():
     """Zeige Vorschau der Änderungen für ausgewählte Area/Domain"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_preview_changes_async())
-    finally:
-        loop.close()
+    return run_async(_preview_changes_async())
 
 
 async def _preview_changes_async():
@@ -623,28 +1049,40 @@ async def _preview_changes_async():
     if not entities:
         return jsonify({"changes": []})
 
+    # Same data and options as an earlier preview: reuse its result
+    cache_key = (
+        renamer_state["data_version"],
+        area_name,
+        domain,
+        bool(skip_reviewed),
+        bool(only_changes),
+        bool(show_disabled),
+    )
+    cached = renamer_state["preview_cache"].get(cache_key)
+    if cached is not None:
+        response_data, proposed = cached
+        renamer_state["proposed_changes"][response_data["preview_id"]] = proposed
+        return json_response(response_data)
+
     # Create states for the restructurer
     client = await init_client()
     all_states = await client.get_states()
 
     # Filtere die relevanten States
-    filtered_states = []
-    entity_ids = [e["entity_id"] for e in entities]
-    logger.info(f"Looking for {len(entity_ids)} entities from area {area_name}, domain {domain}")
-    logger.debug(f"Entity IDs to find: {entity_ids}")
+    entity_ids = {e["entity_id"] for e in entities}
+    logger.info("Looking for %s entities from area %s, domain %s", len(entity_ids), area_name, domain)
+    logger.debug("Entity IDs to find: %s", entity_ids)
 
-    # First add all enabled entities from states
-    for state in all_states:
-        if state["entity_id"] in entity_ids:
-            filtered_states.append(state)
+    # First add all enabled entities from states (one lookup per area entity)
+    state_by_id = {state["entity_id"]: state for state in all_states}
+    filtered_states = [state_by_id[e["entity_id"]] for e in entities if e["entity_id"] in state_by_id]
 
     # Now add disabled entities if show_disabled is True
     if show_disabled:
-        # Find entities that were not found in states (these are disabled)
-        found_entity_ids = {s["entity_id"] for s in filtered_states}
+        # Entities that were not found in states are disabled
         for entity in entities:
             entity_id = entity["entity_id"]
-            if entity_id not in found_entity_ids and entity.get("state") == "disabled":
+            if entity_id not in state_by_id and entity.get("state") == "disabled":
                 # Create a dummy state for disabled entity
                 filtered_states.append(
                     {
@@ -657,15 +1095,10 @@ async def _preview_changes_async():
                     }
                 )
 
-    logger.info(f"Found {len(filtered_states)} states matching the entities (including disabled: {show_disabled})")
+    logger.info("Found %s states matching the entities (including disabled: %s)", len(filtered_states), show_disabled)
 
     # Stelle sicher, dass der Restructurer die aktuelle Struktur hat
-    base_url = os.getenv("HA_URL")
-    token = os.getenv("HA_TOKEN")
-    ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
-
-    ws = HomeAssistantWebSocket(ws_url, token)
-    await ws.connect()
+    ws = await acquire_ws(SETTINGS.ws_url, SETTINGS.ha_token)
 
     try:
         # Lade aktuelle Struktur
@@ -676,36 +1109,47 @@ async def _preview_changes_async():
             filtered_states, skip_reviewed=skip_reviewed, show_reviewed=False
         )
 
-        logger.info(f"Generated mapping with {len(mapping)} entries")
+        logger.info("Generated mapping with %s entries", len(mapping))
 
         # Prepare changes for frontend - grouped by device
         devices_map = {}
         entities_registry = renamer_state["restructurer"].entities
         devices_registry = renamer_state["restructurer"].devices
 
-        logger.info(f"Entities in registry: {len(entities_registry)}, Devices in registry: {len(devices_registry)}")
+        logger.info("Entities in registry: %s, Devices in registry: %s", len(entities_registry), len(devices_registry))
+
+        entities_by_id = {e["entity_id"]: e for e in entities}
+        # device_id -> (device_info, pattern splitting the device name off a friendly name)
+        device_info_cache = {}
 
         for old_id, (new_id, friendly_name) in mapping.items():
             # Finde aktuelle Entity Info
-            current_info = next((e for e in entities if e["entity_id"] == old_id), {})
+            current_info = entities_by_id.get(old_id, {})
 
             # Hole Device Info
             entity_reg = entities_registry.get(old_id, {})
             device_id = entity_reg.get("device_id")
             device_info = None
+            device_name_re = None
 
             if old_id == "light.buro_bucherregal_indirekt_licht":
-                logger.info(f"Debug {old_id}: entity_reg={bool(entity_reg)}, device_id={device_id}")
+                logger.info("Debug %s: entity_reg=%s, device_id=%s", old_id, bool(entity_reg), device_id)
 
             if device_id and device_id in devices_registry:
-                device = devices_registry[device_id]
-                device_info = {
-                    "id": device_id,
-                    "name": device.get("name_by_user") or device.get("name", "Unbekanntes Gerät"),
-                    "manufacturer": device.get("manufacturer", ""),
-                    "model": device.get("model", ""),
-                    "area_id": device.get("area_id"),
-                }
+                cached = device_info_cache.get(device_id)
+                if cached is None:
+                    device = devices_registry[device_id]
+                    device_info = {
+                        "id": device_id,
+                        "name": device.get("name_by_user") or device.get("name", "Unbekanntes Gerät"),
+                        "manufacturer": device.get("manufacturer", ""),
+                        "model": device.get("model", ""),
+                        "area_id": device.get("area_id"),
+                    }
+                    device_name_re = re.compile(re.escape(device_info["name"]) + r"\s*(.*)", re.DOTALL)
+                    device_info_cache[device_id] = (device_info, device_name_re)
+                else:
+                    device_info, device_name_re = cached
 
             # Get registry ID for entity
             registry_id = entity_reg.get("id", "")  # The immutable UUID
@@ -720,11 +1164,11 @@ async def _preview_changes_async():
             # Extract current basename from friendly_name by removing device name prefix
             current_basename = None
             if device_info and current_friendly_name:
-                device_name = device_info["name"]
                 # Check if friendly_name starts with device name
-                if current_friendly_name.startswith(device_name):
-                    current_basename = current_friendly_name[len(device_name) :].strip()
-                elif current_friendly_name != device_name:
+                match = device_name_re.match(current_friendly_name)
+                if match:
+                    current_basename = match.group(1).rstrip()
+                elif current_friendly_name != device_info["name"]:
                     # Friendly name doesn't start with device name, use the whole thing
                     current_basename = current_friendly_name
 
@@ -818,10 +1262,10 @@ async def _preview_changes_async():
         )
 
         # Debug logging
-        logger.info(f"Preview for {area_name}/{domain}: {len(changes)} device groups")
+        logger.info("Preview for %s/%s: %s device groups", area_name, domain, len(changes))
         for i, change in enumerate(changes):
             device_name = change["device"]["current_name"] if change["device"] else "No device"
-            logger.info(f"  Group {i}: {device_name} with {len(change['entities'])} entities")
+            logger.info("  Group %s: %s with %s entities", i, device_name, len(change["entities"]))
 
         # Save for execute
         preview_id = f"{area_name}_{domain}"
@@ -830,6 +1274,12 @@ async def _preview_changes_async():
             "domain": domain,
             "changes": changes,
             "mapping": mapping,
+            # old_id -> the same entity dict as in changes, for single-row updates
+            "entity_index": {
+                entity["old_id"]: entity for device_group in changes for entity in device_group["entities"]
+            },
+            # Lets execute reuse the mapping as long as nothing changed in between
+            "data_version": renamer_state["data_version"],
         }
 
         # Berechne Statistiken
@@ -838,33 +1288,27 @@ async def _preview_changes_async():
             1 for device_group in changes for entity in device_group["entities"] if entity["needs_rename"]
         )
 
-        return jsonify(
-            {
-                "preview_id": preview_id,
-                "changes": changes,
-                "total": total_entities,
-                "need_rename": need_rename,
-            }
-        )
+        response_data = {
+            "preview_id": preview_id,
+            "changes": changes,
+            "total": total_entities,
+            "need_rename": need_rename,
+        }
+        renamer_state["preview_cache"][cache_key] = (response_data, renamer_state["proposed_changes"][preview_id])
+        return json_response(response_data)
 
     except Exception as e:
-        logger.error(f"Error in _preview_changes_async: {str(e)}", exc_info=True)
+        logger.error("Error in _preview_changes_async: %s", e, exc_info=True)
         return jsonify({"error": str(e)}), 500
 
     finally:
-        await ws.disconnect()
+        await release_ws(ws)
 
 
 @app.route("/api/execute", methods=["POST"])
 def execute_changes():
     """Führe ausgewählte Änderungen durch"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_execute_changes_async())
-    finally:
-        loop.close()
+    return run_async(_execute_changes_async())
 
 
 async def _execute_changes_async():
@@ -889,9 +1333,8 @@ async def _execute_changes_async():
         return jsonify({"error": "Keine Entities oder Geräte ausgewählt"}), 400
 
     # Execute renaming
-    base_url = os.getenv("HA_URL")
-    token = os.getenv("HA_TOKEN")
-    ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+    ws_url = SETTINGS.ws_url
+    token = SETTINGS.ha_token
 
     results = {
         "success": [],
@@ -902,35 +1345,32 @@ async def _execute_changes_async():
         "device_failed": [],
     }
 
-    ws = HomeAssistantWebSocket(ws_url, token)
-    await ws.connect()
+    ws = await acquire_ws(ws_url, token)
 
     try:
         entity_registry = EntityRegistry(ws)
         device_registry = DeviceRegistry(ws)
 
         # Dependency Updater nutzt REST API
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        dependency_updater = DependencyUpdater(base_url, token)
+        dependency_updater = DependencyUpdater(SETTINGS.ha_url, SETTINGS.ha_token, session=await get_http_session())
 
-        # Pre-fetch states once for all dependency updates (performance optimization)
+        # Pre-fetch states once; the same /api/states snapshot serves dependency updates
+        # and entity name generation
         logger.info("Pre-fetching states for dependency updates...")
         cached_states = await dependency_updater.get_states()
-        logger.info(f"Cached {len(cached_states)} states")
-
-        # Get states for entity generation
-        client = await init_client()
-        states = await client.get_states()
+        logger.info("Cached %s states", len(cached_states))
+        states_by_id = {s["entity_id"]: s for s in cached_states}
 
-        # Process devices first
+        # Process devices first: rename them all, then reload the structure once
+        renamed_devices = []
+        # Entities already renamed through their device; skipped in the entity pass below
+        already_renamed = set()
         for device_data in selected_devices:
             device_id = device_data["device_id"]
             new_device_name = device_data["new_name"]
-            device_entities = device_data["entities"]
 
             try:
-                logger.info(f"Renaming device {device_id} to {new_device_name}")
+                logger.info("Renaming device %s to %s", device_id, new_device_name)
                 success = await device_registry.rename_device(device_id, new_device_name)
 
                 if success:
@@ -941,56 +1381,7 @@ async def _execute_changes_async():
                             "message": f"Gerät erfolgreich umbenannt zu: {new_device_name}",
                         }
                     )
-
-                    # Only rename entities that were explicitly selected
-                    # Don't automatically rename all device entities when only device is selected
-                    await renamer_state["restructurer"].load_structure(ws)
-
-                    for entity_id in device_entities:
-                        # Skip entities that weren't explicitly selected
-                        if entity_id not in selected_entities:
-                            logger.info(f"Skipping entity {entity_id} - not explicitly selected")
-                            continue
-
-                        # Hole Entity Info aus states
-                        entity_state = next((s for s in states if s["entity_id"] == entity_id), None)
-                        if entity_state:
-                            # Generiere neuen Namen basierend auf aktuellem Device Namen
-                            new_entity_id, new_friendly_name = renamer_state["restructurer"].generate_new_entity_id(
-                                entity_id, entity_state
-                            )
-
-                        if entity_id != new_entity_id:
-                            try:
-                                # Check if entity is disabled and if we should enable it
-                                entity_reg = renamer_state["restructurer"].entities.get(entity_id, {})
-                                is_disabled = entity_reg.get("disabled_by") is not None
-                                should_enable = (
-                                    is_disabled and os.getenv("ENABLE_DISABLED_ENTITIES", "false").lower() == "true"
-                                )
-
-                                # Rename entity and enable if needed
-                                await entity_registry.rename_entity(
-                                    entity_id, new_entity_id, new_friendly_name, enable=should_enable
-                                )
-
-                                if should_enable:
-                                    logger.info(f"Enabled and renamed disabled entity: {entity_id} -> {new_entity_id}")
-
-                                # Update dependencies
-                                dep_results = await dependency_updater.update_all_dependencies(entity_id, new_entity_id, cached_states)
-
-                                results["success"].append(
-                                    {
-                                        "old_id": entity_id,
-                                        "new_id": new_entity_id,
-                                        "message": "Entity erfolgreich umbenannt (durch Gerät)",
-                                    }
-                                )
-
-                            except Exception as e:
-                                logger.error(f"Fehler beim Umbenennen der Entity {entity_id}: {e}")
-                                results["failed"].append({"entity_id": entity_id, "error": str(e)})
+                    renamed_devices.append(device_data)
                 else:
                     results["device_failed"].append(
                         {
@@ -1000,15 +1391,91 @@ async def _execute_changes_async():
                     )
 
             except Exception as e:
-                logger.error(f"Fehler beim Device {device_id}: {e}")
+                logger.error("Fehler beim Device %s: %s", device_id, e)
                 results["device_failed"].append({"device_id": device_id, "error": str(e)})
 
-        # Verarbeite einzelne Entities
-        for old_id, (new_id, friendly_name) in selected_mapping.items():
+        if renamed_devices:
+            # Pick up the new device names before generating entity names
+            try:
+                await renamer_state["restructurer"].load_structure(ws)
+            except Exception as e:
+                logger.error("Fehler beim Neuladen der Struktur: %s", e)
+                # The devices themselves were renamed; report the reload once instead of per device
+                results["structure_reload_error"] = str(e)
+                renamed_devices = []
+
+        # Only rename entities that were explicitly selected
+        # Don't automatically rename all device entities when only device is selected
+        for device_data in renamed_devices:
+            device_id = device_data["device_id"]
             try:
+                for entity_id in device_data["entities"]:
+                    # Skip entities that weren't explicitly selected
+                    if entity_id not in selected_entities:
+                        logger.info("Skipping entity %s - not explicitly selected", entity_id)
+                        continue
+
+                    # Hole Entity Info aus states
+                    entity_state = states_by_id.get(entity_id)
+                    if entity_state:
+                        # Generiere neuen Namen basierend auf aktuellem Device Namen
+                        new_entity_id, new_friendly_name = renamer_state["restructurer"].generate_new_entity_id(
+                            entity_id, entity_state
+                        )
+
+                    if entity_id != new_entity_id:
+                        try:
+                            # Check if entity is disabled and if we should enable it
+                            entity_reg = renamer_state["restructurer"].entities.get(entity_id, {})
+                            is_disabled = entity_reg.get("disabled_by") is not None
+                            should_enable = is_disabled and SETTINGS.enable_disabled_entities
+
+                            # Rename entity and enable if needed
+                            await entity_registry.rename_entity(
+                                entity_id, new_entity_id, new_friendly_name, enable=should_enable
+                            )
+
+                            if should_enable:
+                                logger.info("Enabled and renamed disabled entity: %s -> %s", entity_id, new_entity_id)
+
+                            # Update dependencies
+                            await dependency_updater.update_all_dependencies(entity_id, new_entity_id, cached_states)
+
+                            results["success"].append(
+                                {
+                                    "old_id": entity_id,
+                                    "new_id": new_entity_id,
+                                    "message": "Entity erfolgreich umbenannt (durch Gerät)",
+                                }
+                            )
+                            already_renamed.add(entity_id)
+
+                        except Exception as e:
+                            logger.error("Fehler beim Umbenennen der Entity %s: %s", entity_id, e)
+                            results["failed"].append({"entity_id": entity_id, "error": str(e)})
+
+            except Exception as e:
+                logger.error("Fehler beim Device %s: %s", device_id, e)
+                results["device_failed"].append({"device_id": device_id, "error": str(e)})
+
+        # The preview mapping is still current unless data changed since (override or mapping
+        # edits, reloads) or the device renames above changed the names entity ids derive from
+        preview_is_current = proposed.get("data_version") == renamer_state["data_version"] and not renamed_devices
+
+        # Verarbeite einzelne Entities - concurrently, each task on its own pooled connection
+        dependency_lock = asyncio.Lock()
+        rename_semaphore = asyncio.Semaphore(SETTINGS.rename_concurrency)
+
+        async def _process_entity(old_id, new_id, friendly_name):
+            outcome = TaskResult()
+            entity_ws = None
+            try:
+                entity_ws = await acquire_ws(ws_url, token)
+                entity_registry = EntityRegistry(entity_ws)
+
                 # Recalculate the entity name to ensure overrides are applied
-                current_state = next((s for s in states if s["entity_id"] == old_id), {})
-                if current_state:
+                current_state = states_by_id.get(old_id, {})
+                if current_state and not preview_is_current:
                     # Use restructurer to get the current naming with overrides
                     recalculated_new_id, recalculated_friendly_name = renamer_state[
                         "restructurer"
@@ -1016,13 +1483,12 @@ async def _execute_changes_async():
                     # Use the recalculated names instead of the preview mapping
                     new_id = recalculated_new_id
                     friendly_name = recalculated_friendly_name
-                    logger.info(f"Recalculated entity: {old_id} -> {new_id}, friendly_name: {friendly_name}")
+                    logger.debug("Recalculated entity: %s -> %s, friendly_name: %s", old_id, new_id, friendly_name)
                 else:
-                    logger.info(f"Processing entity: {old_id} -> {new_id}, friendly_name: {friendly_name}")
+                    logger.debug("Processing entity: %s -> %s, friendly_name: %s", old_id, new_id, friendly_name)
 
                 # Check if entity ID or friendly name needs to be changed
-                current_states = next((s for s in states if s["entity_id"] == old_id), {})
-                current_friendly_name = current_states.get("attributes", {}).get("friendly_name", "")
+                current_friendly_name = current_state.get("attributes", {}).get("friendly_name", "")
 
                 needs_id_change = old_id != new_id
                 needs_friendly_name_change = current_friendly_name != friendly_name
@@ -1032,33 +1498,42 @@ async def _execute_changes_async():
                     entity_reg = renamer_state["restructurer"].entities.get(old_id, {})
                     disabled_by_value = entity_reg.get("disabled_by")
                     is_disabled = disabled_by_value is not None
-                    should_enable = is_disabled and os.getenv("ENABLE_DISABLED_ENTITIES", "false").lower() == "true"
+                    should_enable = is_disabled and SETTINGS.enable_disabled_entities
 
                     # Umbenennen (Entity ID und/oder Friendly Name)
-                    logger.info(
-                        f"Updating entity: ID change={needs_id_change}, Name change={needs_friendly_name_change}, "
-                        f"is_disabled={is_disabled}, disabled_by={disabled_by_value}, should_enable={should_enable}"
+                    logger.debug(
+                        "Updating entity: ID change=%s, Name change=%s, "
+                        "is_disabled=%s, disabled_by=%s, should_enable=%s",
+                        needs_id_change,
+                        needs_friendly_name_change,
+                        is_disabled,
+                        disabled_by_value,
+                        should_enable,
                     )
 
                     if needs_id_change:
                         # Rename entity and enable if needed in a single operation
                         await entity_registry.rename_entity(old_id, new_id, friendly_name, enable=should_enable)
                         if should_enable:
-                            logger.info(f"Enabled and renamed disabled entity: {old_id} -> {new_id}")
+                            logger.info("Enabled and renamed disabled entity: %s -> %s", old_id, new_id)
                     else:
                         # Only change friendly name
                         if should_enable:
                             # Enable and update name in one operation
                             await entity_registry.update_entity(old_id, name=friendly_name, enable=True)
-                            logger.info(f"Enabled entity and updated friendly name: {old_id}")
+                            logger.info("Enabled entity and updated friendly name: %s", old_id)
                         else:
                             await entity_registry.update_entity(old_id, name=friendly_name)
 
                     # Update dependencies only on ID change
                     if needs_id_change:
                         try:
-                            logger.info(f"Updating dependencies for: {old_id} -> {new_id}")
-                            dep_results = await dependency_updater.update_all_dependencies(old_id, new_id, cached_states)
+                            logger.info("Updating dependencies for: %s -> %s", old_id, new_id)
+                            # Config updates are read-modify-write; serialize them across tasks
+                            async with dependency_lock:
+                                dep_results = await dependency_updater.update_all_dependencies(
+                                    old_id, new_id, cached_states
+                                )
 
                             # Erstelle Success Entry
                             success_entry = {
@@ -1076,7 +1551,7 @@ async def _execute_changes_async():
                                     "total": dep_results["total_success"],
                                 }
 
-                            results["success"].append(success_entry)
+                            outcome.record("success", success_entry)
 
                             # Warne bei fehlgeschlagenen Dependencies
                             if dep_results["total_failed"] > 0:
@@ -1085,7 +1560,7 @@ async def _execute_changes_async():
                                 failed_items.extend(dep_results["scripts"]["failed"])
                                 failed_items.extend(dep_results["automations"]["failed"])
 
-                                results["dependency_warnings"].append(
+                                outcome.warn(
                                     {
                                         "entity_id": new_id,
                                         "warning": f"Einige Dependencies konnten nicht aktualisiert werden: {', '.join(failed_items)}",
@@ -1093,11 +1568,8 @@ async def _execute_changes_async():
                                 )
 
                         except Exception as e:
-                            logger.error(
-                                f"Fehler beim Update der Dependencies: {e}",
-                                exc_info=True,
-                            )
-                            results["dependency_warnings"].append(
+                            logger.error("Fehler beim Update der Dependencies für %s: %s", new_id, e)
+                            outcome.warn(
                                 {
                                     "entity_id": new_id,
                                     "warning": f"Dependencies konnten nicht automatisch aktualisiert werden: {str(e)}",
@@ -1105,46 +1577,69 @@ async def _execute_changes_async():
                             )
                     else:
                         # Only friendly name changed
-                        results["success"].append(
+                        outcome.record(
+                            "success",
                             {
                                 "old_id": old_id,
                                 "new_id": old_id,  # ID bleibt gleich
                                 "message": f"Friendly Name aktualisiert zu: {friendly_name}",
-                            }
+                            },
                         )
                 else:
                     # Keine Änderung nötig
-                    results["skipped"].append(
+                    outcome.record(
+                        "skipped",
                         {
                             "entity_id": old_id,
                             "message": "Bereits korrekt benannt",
-                        }
+                        },
                     )
 
             except Exception as e:
-                results["failed"].append({"entity_id": old_id, "error": str(e)})
+                outcome.record("failed", {"entity_id": old_id, "error": str(e)})
+            finally:
+                if entity_ws is not None:
+                    await release_ws(entity_ws)
+            return outcome
+
+        async def _guarded(old_id, new_id, friendly_name):
+            async with rename_semaphore:
+                return await _process_entity(old_id, new_id, friendly_name)
+
+        outcomes = await asyncio.gather(
+            *(
+                _guarded(old_id, new_id, name)
+                for old_id, (new_id, name) in selected_mapping.items()
+                if old_id not in already_renamed
+            )
+        )
+        for outcome in outcomes:
+            outcome.merge_into(results)
 
     finally:
-        await ws.disconnect()
+        await release_ws(ws)
 
     # Delete preview
     del renamer_state["proposed_changes"][preview_id]
 
-    # Invalidate broken references cache after changes
-    invalidate_reference_checker_cache()
+    logger.info(
+        "Processed %d entities: %d renamed, %d failed, %d skipped",
+        len(results["success"]) + len(results["failed"]) + len(results["skipped"]),
+        len(results["success"]),
+        len(results["failed"]),
+        len(results["skipped"]),
+    )
+
+    # Update broken references cache after changes
+    update_reference_checker_cache(results)
 
-    return jsonify(results)
+    return stream_json_response(results)
 
 
 @app.route("/api/execute_direct", methods=["POST"])
 def execute_direct():
     """Execute entity renames directly without preview (for hierarchy UI)"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_execute_direct_async())
-    finally:
-        loop.close()
+    return run_async(_execute_direct_async())
 
 
 async def _execute_direct_async():
@@ -1156,9 +1651,8 @@ async def _execute_direct_async():
         return jsonify({"error": "Keine Entities ausgewählt"}), 400
 
     # Execute renaming
-    base_url = os.getenv("HA_URL")
-    token = os.getenv("HA_TOKEN")
-    ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+    ws_url = SETTINGS.ws_url
+    token = SETTINGS.ha_token
 
     results = {
         "success": [],
@@ -1167,100 +1661,115 @@ async def _execute_direct_async():
         "dependency_warnings": [],
     }
 
-    ws = HomeAssistantWebSocket(ws_url, token)
-    await ws.connect()
-
-    try:
-        entity_registry = EntityRegistry(ws)
-        dependency_updater = DependencyUpdater(base_url, token)
+    dependency_updater = DependencyUpdater(SETTINGS.ha_url, token, session=await get_http_session())
 
-        # Pre-fetch states once for all dependency updates (performance optimization)
-        logger.info("Pre-fetching states for dependency updates...")
-        cached_states = await dependency_updater.get_states()
-        logger.info(f"Cached {len(cached_states)} states")
+    # Pre-fetch states once for all dependency updates (performance optimization)
+    logger.info("Pre-fetching states for dependency updates...")
+    cached_states = await dependency_updater.get_states()
+    logger.info("Cached %s states", len(cached_states))
 
-        for entity_data in entities:
-            old_id = entity_data.get("old_id")
-            new_id = entity_data.get("new_id")
-            friendly_name = entity_data.get("new_name")
-            registry_id = entity_data.get("registry_id")
+    # Rename concurrently, each task on its own pooled connection
+    dependency_lock = asyncio.Lock()
+    rename_semaphore = asyncio.Semaphore(SETTINGS.rename_concurrency)
 
-            if not old_id or not new_id:
-                results["failed"].append({"entity_id": old_id, "error": "Missing old_id or new_id"})
-                continue
+    async def _process_entity(entity_data):
+        outcome = TaskResult()
+        old_id = entity_data.get("old_id")
+        new_id = entity_data.get("new_id")
+        friendly_name = entity_data.get("new_name")
+        registry_id = entity_data.get("registry_id")
 
-            try:
-                # Check if entity is disabled and if we should enable it
-                entity_reg = renamer_state["restructurer"].entities.get(old_id, {})
-                current_name = entity_reg.get("original_name") or entity_reg.get("name")
-
-                # Skip only if BOTH ID and name are unchanged
-                id_unchanged = old_id == new_id
-                name_unchanged = friendly_name == current_name
-                if id_unchanged and name_unchanged:
-                    results["skipped"].append({"entity_id": old_id, "reason": "Keine Änderung nötig"})
-                    continue
+        if not old_id or not new_id:
+            outcome.record("failed", {"entity_id": old_id, "error": "Missing old_id or new_id"})
+            return outcome
 
-                # Log what's changing
-                if id_unchanged:
-                    logger.info(f"Name-only change for {old_id}: '{current_name}' -> '{friendly_name}'")
-                else:
-                    logger.info(f"ID change: {old_id} -> {new_id}, name: '{friendly_name}'")
+        entity_ws = None
+        try:
+            # Check if entity is disabled and if we should enable it
+            entity_reg = renamer_state["restructurer"].entities.get(old_id, {})
+            current_name = entity_reg.get("original_name") or entity_reg.get("name")
+
+            # Skip only if BOTH ID and name are unchanged
+            id_unchanged = old_id == new_id
+            name_unchanged = friendly_name == current_name
+            if id_unchanged and name_unchanged:
+                outcome.record("skipped", {"entity_id": old_id, "reason": "Keine Änderung nötig"})
+                return outcome
+
+            # Log what's changing
+            if id_unchanged:
+                logger.debug("Name-only change for %s: '%s' -> '%s'", old_id, current_name, friendly_name)
+            else:
+                logger.debug("ID change: %s -> %s, name: '%s'", old_id, new_id, friendly_name)
 
-                is_disabled = entity_reg.get("disabled_by") is not None
-                should_enable = is_disabled and os.getenv("ENABLE_DISABLED_ENTITIES", "false").lower() == "true"
+            is_disabled = entity_reg.get("disabled_by") is not None
+            should_enable = is_disabled and SETTINGS.enable_disabled_entities
 
-                # Rename entity
-                await entity_registry.rename_entity(old_id, new_id, friendly_name, enable=should_enable)
+            # Rename entity
+            entity_ws = await acquire_ws(ws_url, token)
+            await EntityRegistry(entity_ws).rename_entity(old_id, new_id, friendly_name, enable=should_enable)
 
-                if should_enable:
-                    logger.info(f"Enabled and renamed disabled entity: {old_id} -> {new_id}")
+            if should_enable:
+                logger.info("Enabled and renamed disabled entity: %s -> %s", old_id, new_id)
 
-                # Update dependencies (automations, scenes, scripts)
+            # Update dependencies (automations, scenes, scripts)
+            # Config updates are read-modify-write; serialize them across tasks
+            async with dependency_lock:
                 dep_results = await dependency_updater.update_all_dependencies(old_id, new_id, cached_states)
-                if dep_results.get("total_failed", 0) > 0:
-                    # Collect all failed updates from scenes, scripts, automations
-                    failed_updates = (
-                        dep_results.get("scenes", {}).get("failed", []) +
-                        dep_results.get("scripts", {}).get("failed", []) +
-                        dep_results.get("automations", {}).get("failed", [])
-                    )
-                    results["dependency_warnings"].append({
-                        "entity_id": old_id,
-                        "new_id": new_id,
-                        "failed_updates": failed_updates
-                    })
-
-                results["success"].append({
-                    "old_id": old_id,
+            if dep_results.get("total_failed", 0) > 0:
+                # Collect all failed updates from scenes, scripts, automations
+                failed_updates = (
+                    dep_results.get("scenes", {}).get("failed", []) +
+                    dep_results.get("scripts", {}).get("failed", []) +
+                    dep_results.get("automations", {}).get("failed", [])
+                )
+                outcome.warn({
+                    "entity_id": old_id,
                     "new_id": new_id,
-                    "message": f"Entity erfolgreich umbenannt: {old_id} -> {new_id}"
+                    "failed_updates": failed_updates
                 })
-                logger.info(f"Successfully renamed: {old_id} -> {new_id}")
 
-            except Exception as e:
-                logger.error(f"Error renaming entity {old_id}: {e}")
-                results["failed"].append({"entity_id": old_id, "error": str(e)})
+            outcome.record("success", {
+                "old_id": old_id,
+                "new_id": new_id,
+                "message": f"Entity erfolgreich umbenannt: {old_id} -> {new_id}"
+            })
+            logger.info("Successfully renamed: %s -> %s", old_id, new_id)
 
-    finally:
-        await ws.disconnect()
+        except Exception as e:
+            logger.error("Error renaming entity %s: %s", old_id, e)
+            outcome.record("failed", {"entity_id": old_id, "error": str(e)})
+        finally:
+            if entity_ws is not None:
+                await release_ws(entity_ws)
+        return outcome
+
+    async def _guarded(entity_data):
+        async with rename_semaphore:
+            return await _process_entity(entity_data)
+
+    outcomes = await asyncio.gather(*(_guarded(entity_data) for entity_data in entities))
+    for outcome in outcomes:
+        outcome.merge_into(results)
+
+    logger.info(
+        "Processed %d entities: %d renamed, %d failed, %d skipped",
+        len(results["success"]) + len(results["failed"]) + len(results["skipped"]),
+        len(results["success"]),
+        len(results["failed"]),
+        len(results["skipped"]),
+    )
 
-    # Invalidate broken references cache after changes
-    invalidate_reference_checker_cache()
+    # Update broken references cache after changes
+    update_reference_checker_cache(results)
 
-    return jsonify(results)
+    return stream_json_response(results)
 
 
 @app.route("/api/stats")
 def get_stats():
     """Hole Statistiken über alle Entities"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_get_stats_async())
-    finally:
-        loop.close()
+    return run_async(_get_stats_async())
 
 
 async def _get_stats_async():
@@ -1270,173 +1779,243 @@ async def _get_stats_async():
 
     stats = {
         "total_entities": len(states),
-        "domains": {},
+        "domains": dict(Counter(state["entity_id"].partition(".")[0] for state in states)),
         "areas": len(renamer_state.get("areas", {})),
     }
 
-    for state in states:
-        domain = state["entity_id"].split(".")[0]
-        stats["domains"][domain] = stats["domains"].get(domain, 0) + 1
-
     return jsonify(stats)
 
 
 @app.route("/api/dependencies/<entity_id>")
 def get_dependencies(entity_id):
     """Hole Dependencies für eine Entity"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_get_dependencies_async(entity_id))
-    finally:
-        loop.close()
+    return run_async(_get_dependencies_async(entity_id))
 
 
 async def _get_dependencies_async(entity_id):
     """Async implementation of get_dependencies"""
-    dependencies = {}
-    logger.info(f"Suche Dependencies für: {entity_id}")
+    logger.info("Suche Dependencies für: %s", entity_id)
 
     try:
-        client = await init_client()
-        # Hole alle States um Scenes zu finden
-        states = await client.get_states()
+        dependencies = (await find_dependencies([entity_id]))[entity_id]
+    except Exception as e:
+        logger.error("Fehler beim Laden der Dependencies: %s", e)
+        dependencies = {"error": str(e)}
 
-        # Suche in Scenes
-        scene_refs = []
-        for state in states:
-            if state["entity_id"].startswith("scene."):
-                # Scene Entities sind in den Attributes
-                scene_entities = state.get("attributes", {}).get("entity_id", [])
-                if isinstance(scene_entities, list) and entity_id in scene_entities:
-                    scene_refs.append(state["entity_id"])
+    return jsonify(dependencies)
 
-        if scene_refs:
-            dependencies["Scenes"] = scene_refs
 
-        # Suche in Gruppen
-        group_refs = []
-        for state in states:
-            if state["entity_id"].startswith("group."):
-                group_entities = state.get("attributes", {}).get("entity_id", [])
-                if isinstance(group_entities, list) and entity_id in group_entities:
-                    group_refs.append(state["entity_id"])
+@app.route("/api/dependencies/batch", methods=["POST"])
+def get_dependencies_batch():
+    """Hole Dependencies für mehrere Entities in einem Durchlauf"""
+    return run_async(_get_dependencies_batch_async())
 
-        if group_refs:
-            dependencies["Groups"] = group_refs
 
-        # Suche in Scripts
-        script_refs = []
-        for state in states:
-            if state["entity_id"].startswith("script."):
-                # Check if entity is used in the script
-                state_str = json.dumps(state.get("attributes", {}))
-                if entity_id in state_str:
-                    script_refs.append(state["entity_id"])
+async def _get_dependencies_batch_async():
+    """Async implementation of get_dependencies_batch"""
+    data = request.json
+    is_valid, error = validate_json_input(data, ["entity_ids"])
+    if not is_valid:
+        return jsonify({"error": error}), 400
+    if not isinstance(data["entity_ids"], list):
+        return jsonify({"error": "entity_ids must be a list"}), 400
 
-        if script_refs:
-            dependencies["Scripts"] = script_refs
+    raw_entity_ids = data["entity_ids"]
+    sanitized = [sanitize_entity_id(entity_id) for entity_id in raw_entity_ids]
+    invalid = [str(raw) for raw, entity_id in zip(raw_entity_ids, sanitized) if not entity_id]
+    if invalid:
+        return jsonify({"error": "Invalid entity IDs", "invalid_entity_ids": invalid}), 400
 
-        # Suche in Automations
-        automation_refs = []
-        logger.info(f"Suche Automations die {entity_id} verwenden...")
+    entity_ids = list(dict.fromkeys(sanitized))
+    logger.info("Suche Dependencies für %s Entities", len(entity_ids))
 
-        # Filtere alle Automation States
-        automation_states = [s for s in states if s["entity_id"].startswith("automation.")]
-        logger.info(f"Gefunden: {len(automation_states)} Automations")
+    try:
+        return stream_json_response(await find_dependencies(entity_ids))
+    except Exception as e:
+        logger.error("Fehler beim Laden der Dependencies: %s", e)
+        return jsonify({"error": str(e)}), 500
 
-        # Check each automation
-        for i, automation_state in enumerate(automation_states):
-            automation_entity_id = automation_state["entity_id"]
-            automation_name = automation_state.get("attributes", {}).get("friendly_name", automation_entity_id)
 
-            logger.debug(f"Prüfe Automation {i+1}/{len(automation_states)}: {automation_name}")
+async def find_dependencies(entity_ids: List[str]) -> Dict[str, Dict[str, List[str]]]:
+    """Find scenes, groups, scripts and automations referencing each entity.
 
-            # Check the automation attributes
-            attributes = automation_state.get("attributes", {})
+    States are fetched and script/automation attributes serialized once, so K
+    entities cost one pass over the states instead of K. The CPU-bound scans run
+    in a worker thread to keep the shared event loop responsive.
 
-            # Log die ersten paar Automations komplett
-            if i < 3:
-                logger.debug(f"Automation {automation_name} attributes keys: {list(attributes.keys())}")
+    Args:
+        entity_ids: Entity IDs to look up
 
-            # Suche in den gesamten Attributes (inkl. last_triggered, etc.)
-            attributes_str = json.dumps(attributes)
+    Returns:
+        Dict of entity_id -> {"Scenes": [...], "Groups": [...], "Scripts": [...], "Automations": [...]},
+        only containing non-empty categories
+    """
+    # Hole alle States um Scenes zu finden
+    states = await get_states_cached()
 
-            # Log wenn "Diele" im Namen ist
-            if "diele" in automation_name.lower():
-                logger.info(f"Automation mit 'Diele' im Namen: {automation_name}")
-                logger.debug(f"Attributes (erste 500 Zeichen): {attributes_str[:500]}")
-
-            # Check if the entity is mentioned in the attributes
-            if entity_id in attributes_str:
-                logger.info(f"Entity {entity_id} gefunden in Automation: {automation_name}")
-                automation_refs.append(automation_entity_id)
-
-            # Special handling for blueprint-based automations
-            # Diese haben oft ihre Entity-Referenzen in den "variables" oder "use_blueprint" Feldern
-            if "use_blueprint" in attributes:
-                blueprint_data = attributes.get("use_blueprint", {})
-                blueprint_str = json.dumps(blueprint_data)
-                logger.debug(f"Blueprint-Automation gefunden: {automation_name}")
-                if entity_id in blueprint_str:
-                    logger.info(f"Entity {entity_id} gefunden in Blueprint-Automation: {automation_name}")
-                    if automation_entity_id not in automation_refs:
-                        automation_refs.append(automation_entity_id)
-
-        # If no automations were found via states, get the configurations via REST API
-        if not automation_refs:
-            logger.info("Versuche Automation-Konfigurationen über REST API zu laden...")
-            try:
-                base_url = os.getenv("HA_URL")
-                token = os.getenv("HA_TOKEN")
-                headers = {
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json",
-                }
+    # The index is only valid for the states snapshot it was built from
+    cached_index = renamer_state["member_index"]
+    member_index = cached_index[1] if cached_index is not None and cached_index[0] is states else None
 
-                # Gehe durch alle gefundenen Automations und hole ihre Configs
-                for automation_state in automation_states:
-                    automation_id = automation_state.get("attributes", {}).get("id")
-                    automation_name = automation_state.get("attributes", {}).get(
-                        "friendly_name", automation_state["entity_id"]
-                    )
+    loop = asyncio.get_running_loop()
+    data_version = renamer_state["data_version"]
+    results, automation_states, member_index = await loop.run_in_executor(
+        _scan_executor, _scan_states, entity_ids, states, member_index
+    )
+    # Don't resurrect an index that was invalidated while the scan was running
+    if renamer_state["data_version"] == data_version:
+        renamer_state["member_index"] = (states, member_index)
+
+    # If no automations were found via states, get the configurations via REST API
+    missing = [entity_id for entity_id in entity_ids if "Automations" not in results[entity_id]]
+    if missing:
+        config_bodies = await _fetch_automation_config_bodies(automation_states)
+        config_refs = await loop.run_in_executor(_scan_executor, _scan_config_bodies, missing, config_bodies)
+        for entity_id in missing:
+            if config_refs[entity_id]:
+                results[entity_id]["Automations"] = config_refs[entity_id]
+            else:
+                logger.info("Keine Automations gefunden die %s verwenden", entity_id)
 
-                    if automation_id:
-                        # Get the automation config via REST API
-                        config_url = f"{base_url}/api/config/automation/config/{automation_id}"
+    return results
 
-                        async with aiohttp.ClientSession() as session:
-                            async with session.get(config_url, headers=headers) as response:
-                                if response.status == 200:
-                                    config = await response.json()
-                                    config_str = json.dumps(config)
 
-                                    # Debug for Diele automation
-                                    if "diele" in automation_name.lower():
-                                        logger.debug(f"Config für {automation_name}: {config_str[:500]}...")
+def _mentions_entity(entity_id: str):
+    """Whole-word matcher, so light.kitchen does not hit light.kitchen_2 (scans serialized bytes)"""
+    return re.compile(rb"\b" + re.escape(entity_id.encode()) + rb"\b").search
 
-                                    if entity_id in config_str:
-                                        logger.info(f"Entity {entity_id} gefunden in Automation: {automation_name}")
-                                        automation_refs.append(automation_state["entity_id"])
-                                else:
-                                    logger.warning(
-                                        f"Fehler beim Abrufen der Config für {automation_name}: {response.status}"
-                                    )
 
-            except Exception as e:
-                logger.error(f"Fehler beim Laden der Automation-Configs über REST API: {e}")
+def _scan_states(
+    entity_ids: List[str], states: List[Dict], member_index: Optional[Dict[str, List[str]]]
+) -> Tuple[Dict[str, Dict[str, List[str]]], List[Dict], Dict[str, List[str]]]:
+    """CPU part of find_dependencies: match entities against the current states.
 
+    Returns:
+        Tuple of (dependencies per entity, automation states, member index)
+    """
+    # Scenes und Gruppen über den (gecachten) Member-Index
+    if member_index is None:
+        member_index = build_member_index(states)
+
+    # Scripts und Automations einmal serialisieren, in einem Durchlauf über alle States
+    # Blueprint inputs are part of the attributes, so this covers blueprint automations too
+    script_bodies = []
+    automation_bodies = []
+    automation_states = []
+    for state in states:
+        state_id = state["entity_id"]
+        domain = state_id.partition(".")[0]
+        if domain == "script":
+            script_bodies.append((state_id, json_bytes(state.get("attributes", {}))))
+        elif domain == "automation":
+            automation_states.append(state)
+            attributes = state.get("attributes", {})
+            automation_bodies.append((state_id, attributes.get("friendly_name", state_id), json_bytes(attributes)))
+
+    logger.info("Gefunden: %s Automations", len(automation_states))
+
+    results = {}
+    for entity_id in entity_ids:
+        dependencies = {}
+        mentions_entity = _mentions_entity(entity_id)
+
+        containers = member_index.get(entity_id, [])
+        scene_refs = [state_id for state_id in containers if state_id.startswith("scene.")]
+        group_refs = [state_id for state_id in containers if state_id.startswith("group.")]
+        script_refs = [state_id for state_id, body in script_bodies if mentions_entity(body)]
+
+        # Suche in den gesamten Attributes (inkl. last_triggered, use_blueprint, etc.)
+        automation_refs = []
+        for state_id, automation_name, body in automation_bodies:
+            if mentions_entity(body):
+                logger.info("Entity %s gefunden in Automation: %s", entity_id, automation_name)
+                automation_refs.append(state_id)
+
+        if scene_refs:
+            dependencies["Scenes"] = scene_refs
+        if group_refs:
+            dependencies["Groups"] = group_refs
+        if script_refs:
+            dependencies["Scripts"] = script_refs
         if automation_refs:
             dependencies["Automations"] = automation_refs
-        else:
-            logger.info(f"Keine Automations gefunden die {entity_id} verwenden")
+
+        results[entity_id] = dependencies
+
+    return results, automation_states, member_index
+
+
+def _scan_config_bodies(
+    entity_ids: List[str], config_bodies: List[Tuple[str, str, bytes]]
+) -> Dict[str, List[str]]:
+    """CPU part of the REST fallback: automations whose raw config mentions each entity"""
+    config_refs = {}
+    for entity_id in entity_ids:
+        mentions_entity = _mentions_entity(entity_id)
+        config_refs[entity_id] = []
+        for state_id, automation_name, body in config_bodies:
+            if mentions_entity(body):
+                logger.info("Entity %s gefunden in Automation: %s", entity_id, automation_name)
+                config_refs[entity_id].append(state_id)
+    return config_refs
+
+
+async def _fetch_automation_config_bodies(automation_states: List[Dict]) -> List[Tuple[str, str, bytes]]:
+    """Fetch the raw automation configs via REST API as (entity_id, name, body) tuples"""
+    logger.info("Versuche Automation-Konfigurationen über REST API zu laden...")
+    config_bodies = []
+    try:
+        base_url = SETTINGS.ha_url
+        token = SETTINGS.ha_token
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
+
+        # Alle Automation-Configs parallel über eine gemeinsame Session holen
+        session = await get_http_session()
+        semaphore = asyncio.Semaphore(16)
+
+        async def _fetch_config_body(automation_id):
+            config_url = f"{base_url}/api/config/automation/config/{automation_id}"
+            async with semaphore:
+                async with session.get(config_url, headers=headers) as response:
+                    if response.status != 200:
+                        return response.status, None
+                    # Search the raw JSON body; no need to parse and re-serialize it
+                    return response.status, await response.read()
+
+        configured = [
+            (state, automation_id)
+            for state in automation_states
+            if (automation_id := state.get("attributes", {}).get("id"))
+        ]
+        responses = await asyncio.gather(
+            *(_fetch_config_body(automation_id) for _, automation_id in configured),
+            return_exceptions=True,
+        )
+
+        for (automation_state, _), response in zip(configured, responses):
+            automation_name = automation_state.get("attributes", {}).get("friendly_name", automation_state["entity_id"])
+            if isinstance(response, Exception):
+                logger.warning("Fehler beim Abrufen der Config für %s: %s", automation_name, response)
+                continue
+
+            status, config_body = response
+            if config_body is None:
+                logger.warning("Fehler beim Abrufen der Config für %s: %s", automation_name, status)
+                continue
+
+            # Debug for Diele automation
+            if "diele" in automation_name.lower():
+                logger.debug("Config für %s: %s...", automation_name, config_body[:500].decode(errors="replace"))
+
+            config_bodies.append((automation_state["entity_id"], automation_name, config_body))
 
     except Exception as e:
-        logger.error(f"Fehler beim Laden der Dependencies: {e}")
-        dependencies = {"error": str(e)}
+        logger.error("Fehler beim Laden der Automation-Configs über REST API: %s", e)
 
-    return jsonify(dependencies)
+    return config_bodies
 
 
 # Global reference checker instance (cached)
@@ -1446,8 +2025,8 @@ _reference_checker: Optional[ReferenceChecker] = None
 def get_reference_checker() -> ReferenceChecker:
     """Get or create the reference checker instance."""
     global _reference_checker
-    base_url = os.getenv("HA_URL")
-    token = os.getenv("HA_TOKEN")
+    base_url = SETTINGS.ha_url
+    token = SETTINGS.ha_token
     if _reference_checker is None:
         _reference_checker = ReferenceChecker(base_url, token)
     return _reference_checker
@@ -1458,17 +2037,32 @@ def invalidate_reference_checker_cache():
     global _reference_checker
     if _reference_checker is not None:
         _reference_checker.invalidate_cache()
+    renamer_state["member_index"] = None
+
+
+def update_reference_checker_cache(results: Dict):
+    """Patch the reference checker cache with successful renames instead of rescanning.
+
+    Device renames, failed dependency updates or large batches still invalidate
+    the whole cache; a fresh scan is cheaper and safer there.
+    """
+    renames = [(item["old_id"], item["new_id"]) for item in results["success"]]
+    if (
+        _reference_checker is None
+        or results.get("device_success")
+        or results["dependency_warnings"]
+        or len(renames) > REFERENCE_PATCH_LIMIT
+    ):
+        invalidate_reference_checker_cache()
+        return
+    for old_id, new_id in renames:
+        _reference_checker.patch_rename(old_id, new_id)
 
 
 @app.route("/api/broken_references")
 def get_broken_references():
     """Hole alle broken references (verwaiste Entity-Referenzen)."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_get_broken_references_async())
-    finally:
-        loop.close()
+    return run_async(_get_broken_references_async())
 
 
 async def _get_broken_references_async():
@@ -1488,8 +2082,8 @@ async def _get_broken_references_async():
             entity_registry=entity_registry
         )
 
-        return jsonify({
-            "broken": [ref.to_dict() for ref in broken],
+        return stream_json_response({
+            "broken": (ref.to_dict() for ref in broken),
             "total_broken": len(broken),
             "cached": not force_refresh and checker._broken_refs_cache is not None
         })
@@ -1501,12 +2095,7 @@ async def _get_broken_references_async():
 @app.route("/api/suggestions/<path:missing_entity_id>")
 def get_suggestions(missing_entity_id):
     """Hole Ersatz-Vorschläge für eine fehlende Entity."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_get_suggestions_async(missing_entity_id))
-    finally:
-        loop.close()
+    return run_async(_get_suggestions_async(missing_entity_id))
 
 
 async def _get_suggestions_async(missing_entity_id):
@@ -1527,12 +2116,7 @@ async def _get_suggestions_async(missing_entity_id):
 @app.route("/api/fix_reference", methods=["POST"])
 def fix_reference():
     """Ersetze eine Entity-Referenz in einer Config."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_fix_reference_async())
-    finally:
-        loop.close()
+    return run_async(_fix_reference_async())
 
 
 async def _fix_reference_async():
@@ -1552,17 +2136,14 @@ async def _fix_reference_async():
     new_entity_id = sanitize_entity_id(data.get("new_entity_id"))
 
     try:
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
+        base_url = SETTINGS.ha_url
+        token = SETTINGS.ha_token
 
         logger.info(f"Fixing ALL references: {old_entity_id} -> {new_entity_id}")
 
         # Get all broken references to find all configs with this missing entity
         checker = get_reference_checker()
-        broken_refs = await checker.scan_all_references(use_cache=True)
-
-        # Filter to only those with matching missing_entity_id
-        refs_to_fix = [r for r in broken_refs if r.missing_entity_id == old_entity_id]
+        refs_to_fix = await checker.refs_for_missing(old_entity_id)
         logger.info(f"Found {len(refs_to_fix)} references to fix for {old_entity_id}")
 
         if not refs_to_fix:
@@ -1572,47 +2153,99 @@ async def _fix_reference_async():
             }), 404
 
         # Use dependency updater to replace the references
-        updater = DependencyUpdater(base_url, token)
-        states = await updater.get_states()
+        updater = DependencyUpdater(base_url, token, session=await get_http_session())
 
-        # Build lookup for numeric IDs
-        state_lookup = {s["entity_id"]: s for s in states}
+        # Lookup for numeric IDs
+        state_lookup = await get_state_lookup_cached()
 
         results = {"fixed": [], "failed": []}
 
-        for ref in refs_to_fix:
-            success = False
+        # One update per config - a config can reference the missing entity several times,
+        # and concurrent read-modify-write updates of the same config would race
+        unique_refs = list({(ref.config_type, ref.config_id): ref for ref in refs_to_fix}.values())
+        semaphore = asyncio.Semaphore(REFERENCE_FIX_CONCURRENCY)
+
+        async def _fix_one(ref):
             config_id = ref.config_id
+            async with semaphore:
+                if ref.config_type == "automation":
+                    state = state_lookup.get(config_id)
+                    if state:
+                        numeric_id = state.get("attributes", {}).get("id")
+                        if numeric_id:
+                            return await updater.update_automation_entities(
+                                config_id, numeric_id, old_entity_id, new_entity_id
+                            )
 
-            if ref.config_type == "automation":
-                state = state_lookup.get(config_id)
-                if state:
-                    numeric_id = state.get("attributes", {}).get("id")
-                    if numeric_id:
-                        success = await updater.update_automation_entities(
-                            config_id, numeric_id, old_entity_id, new_entity_id
-                        )
+                elif ref.config_type == "scene":
+                    state = state_lookup.get(config_id)
+                    if state:
+                        numeric_id = state.get("attributes", {}).get("id")
+                        if numeric_id:
+                            return await updater.update_scene_entities(
+                                config_id, numeric_id, old_entity_id, new_entity_id
+                            )
 
-            elif ref.config_type == "scene":
-                state = state_lookup.get(config_id)
-                if state:
-                    numeric_id = state.get("attributes", {}).get("id")
-                    if numeric_id:
-                        success = await updater.update_scene_entities(
-                            config_id, numeric_id, old_entity_id, new_entity_id
-                        )
+                elif ref.config_type == "script":
+                    return await updater.update_script_entities(
+                        config_id, old_entity_id, new_entity_id
+                    )
 
-            elif ref.config_type == "script":
-                success = await updater.update_script_entities(
-                    config_id, old_entity_id, new_entity_id
-                )
+            return False
+
+        def _log_outcome(ref, outcome):
+            """Log one config's outcome; returns True if it was fixed"""
+            if isinstance(outcome, Exception):
+                logger.error("Error fixing %s %s: %s", ref.config_type, ref.config_id, outcome)
+            if outcome is True:
+                logger.info("Fixed %s %s", ref.config_type, ref.config_id)
+                return True
+            logger.warning("Failed to fix %s %s", ref.config_type, ref.config_id)
+            return False
+
+        if request.accept_mimetypes.best == "text/event-stream":
+            # Report every config as soon as it is done, then a summary
+            async def _fix_tagged(ref):
+                try:
+                    return ref, await _fix_one(ref)
+                except Exception as e:
+                    return ref, e
 
-            if success:
-                results["fixed"].append(config_id)
-                logger.info(f"Fixed {ref.config_type} {config_id}")
-            else:
-                results["failed"].append(config_id)
-                logger.warning(f"Failed to fix {ref.config_type} {config_id}")
+            async def _events():
+                fixed_count = failed_count = 0
+                tasks = [asyncio.ensure_future(_fix_tagged(ref)) for ref in unique_refs]
+                try:
+                    yield {"total": len(tasks)}
+                    for completed in asyncio.as_completed(tasks):
+                        ref, outcome = await completed
+                        fixed = _log_outcome(ref, outcome)
+                        fixed_count += fixed
+                        failed_count += not fixed
+                        yield {"config_id": ref.config_id, "config_type": ref.config_type, "fixed": fixed}
+                finally:
+                    # Let started fixes finish even if the client went away
+                    await asyncio.gather(*tasks)
+                    invalidate_reference_checker_cache()
+
+                logger.info("Fixed %s references, %s failed", fixed_count, failed_count)
+                summary = {
+                    "done": True,
+                    "success": fixed_count > 0,
+                    "old_entity_id": old_entity_id,
+                    "new_entity_id": new_entity_id,
+                    "fixed_count": fixed_count,
+                    "failed_count": failed_count,
+                }
+                if not fixed_count:
+                    summary["error"] = "Failed to update any references"
+                yield summary
+
+            return event_stream_response(_events())
+
+        outcomes = await asyncio.gather(*(_fix_one(ref) for ref in unique_refs), return_exceptions=True)
+
+        for ref, outcome in zip(unique_refs, outcomes):
+            results["fixed" if _log_outcome(ref, outcome) else "failed"].append(ref.config_id)
 
         # Invalidate cache after fixes
         invalidate_reference_checker_cache()
@@ -1646,12 +2279,7 @@ async def _fix_reference_async():
 @app.route("/api/all_entities")
 def get_all_entities():
     """Hole alle Entities für Autocomplete."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_get_all_entities_async())
-    finally:
-        loop.close()
+    return run_async(_get_all_entities_async())
 
 
 async def _get_all_entities_async():
@@ -1660,7 +2288,7 @@ async def _get_all_entities_async():
         checker = get_reference_checker()
         entities = await checker.get_all_entities()
 
-        return jsonify({
+        return json_response({
             "entities": entities,
             "total": len(entities)
         })
@@ -1672,13 +2300,7 @@ async def _get_all_entities_async():
 @app.route("/api/update_mapping", methods=["POST"])
 def update_mapping():
     """Aktualisiert das Mapping für eine einzelne Entity"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_update_mapping_async())
-    finally:
-        loop.close()
+    return run_async(_update_mapping_async())
 
 
 async def _update_mapping_async():
@@ -1706,13 +2328,9 @@ async def _update_mapping_async():
         proposed["mapping"][old_id] = (new_id, new_name)
 
         # Also update in the changes list for the UI
-        for device_group in proposed["changes"]:
-            for entity in device_group["entities"]:
-                if entity["old_id"] == old_id:
-                    entity["new_id"] = new_id
-                    entity["new_name"] = new_name
-                    entity["needs_rename"] = old_id != new_id
-                    break
+        entity = proposed["entity_index"].get(old_id)
+        if entity:
+            entity.update(new_id=new_id, new_name=new_name, needs_rename=old_id != new_id)
 
         logger.info(f"Updated mapping for {old_id} -> {new_id}")
         return jsonify({"success": True})
@@ -1723,13 +2341,7 @@ async def _update_mapping_async():
 @app.route("/api/set_entity_override", methods=["POST"])
 def set_entity_override():
     """Setze Entity Name Override"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_set_entity_override_async())
-    finally:
-        loop.close()
+    return run_async(_set_entity_override_async())
 
 
 async def _set_entity_override_async():
@@ -1753,11 +2365,7 @@ async def _set_entity_override_async():
             renamer_state["naming_overrides"].remove_entity_override(registry_id)
 
         # Finde die Entity ID basierend auf der Registry ID
-        entity_id = None
-        for eid, entity in renamer_state["restructurer"].entities.items():
-            if entity.get("id") == registry_id:
-                entity_id = eid
-                break
+        entity_id = renamer_state["restructurer"].get_entity_id_by_registry_id(registry_id)
 
         # Calculate the new entity ID and friendly name with the override
         new_id = None
@@ -1765,23 +2373,18 @@ async def _set_entity_override_async():
 
         if entity_id:
             # Get current entity state for proper calculation
-            client = await init_client()
-            states = await client.get_states()
-            entity_state = next(
-                (s for s in states if s["entity_id"] == entity_id), {"entity_id": entity_id, "attributes": {}}
-            )
+            state_lookup = await get_state_lookup_cached()
+            entity_state = state_lookup.get(entity_id, {"entity_id": entity_id, "attributes": {}})
 
             # Calculate with current override
             new_id, new_friendly_name = renamer_state["restructurer"].generate_new_entity_id(entity_id, entity_state)
 
             if override_name:
                 # Update the friendly name in Home Assistant
-                base_url = os.getenv("HA_URL")
-                token = os.getenv("HA_TOKEN")
-                ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+                token = SETTINGS.ha_token
+                ws_url = SETTINGS.ws_url
 
-                ws = HomeAssistantWebSocket(ws_url, token)
-                await ws.connect()
+                ws = await acquire_ws(ws_url, token)
 
                 try:
                     entity_registry = EntityRegistry(ws)
@@ -1789,7 +2392,7 @@ async def _set_entity_override_async():
                     await entity_registry.update_entity(entity_id=entity_id, name=new_friendly_name)
                     logger.info(f"Entity {entity_id} Friendly Name aktualisiert zu: {new_friendly_name}")
                 finally:
-                    await ws.disconnect()
+                    await release_ws(ws)
 
         return jsonify(
             {
@@ -1807,12 +2410,7 @@ async def _set_entity_override_async():
 @app.route("/api/enable_entity", methods=["POST"])
 def enable_entity():
     """Enable a disabled entity"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_enable_entity_async())
-    finally:
-        loop.close()
+    return run_async(_enable_entity_async())
 
 
 async def _enable_entity_async():
@@ -1828,12 +2426,10 @@ async def _enable_entity_async():
         return jsonify({"error": "Invalid entity ID"}), 400
 
     try:
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+        token = SETTINGS.ha_token
+        ws_url = SETTINGS.ws_url
 
-        ws = HomeAssistantWebSocket(ws_url, token)
-        await ws.connect()
+        ws = await acquire_ws(ws_url, token)
 
         try:
             entity_registry = EntityRegistry(ws)
@@ -1842,7 +2438,7 @@ async def _enable_entity_async():
 
             return jsonify({"success": True, "entity_id": entity_id})
         finally:
-            await ws.disconnect()
+            await release_ws(ws)
 
     except Exception as e:
         error_msg = str(e)
@@ -1861,12 +2457,7 @@ async def _enable_entity_async():
 @app.route("/api/enable_device", methods=["POST"])
 def enable_device():
     """Enable a disabled device"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_enable_device_async())
-    finally:
-        loop.close()
+    return run_async(_enable_device_async())
 
 
 async def _enable_device_async():
@@ -1882,12 +2473,10 @@ async def _enable_device_async():
         return jsonify({"error": "Invalid device ID"}), 400
 
     try:
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+        token = SETTINGS.ha_token
+        ws_url = SETTINGS.ws_url
 
-        ws = HomeAssistantWebSocket(ws_url, token)
-        await ws.connect()
+        ws = await acquire_ws(ws_url, token)
 
         try:
             device_registry = DeviceRegistry(ws)
@@ -1896,7 +2485,7 @@ async def _enable_device_async():
 
             return jsonify({"success": True, "device_id": device_id})
         finally:
-            await ws.disconnect()
+            await release_ws(ws)
 
     except Exception as e:
         logger.error(f"Error enabling device {device_id}: {e}")
@@ -1906,12 +2495,7 @@ async def _enable_device_async():
 @app.route("/api/assign_device_area", methods=["POST"])
 def assign_device_area():
     """Assign a device to an area"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_assign_device_area_async())
-    finally:
-        loop.close()
+    return run_async(_assign_device_area_async())
 
 
 async def _assign_device_area_async():
@@ -1932,12 +2516,10 @@ async def _assign_device_area_async():
         area_id = sanitize_registry_id(area_id)
 
     try:
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+        token = SETTINGS.ha_token
+        ws_url = SETTINGS.ws_url
 
-        ws = HomeAssistantWebSocket(ws_url, token)
-        await ws.connect()
+        ws = await acquire_ws(ws_url, token)
 
         try:
             device_registry = DeviceRegistry(ws)
@@ -1946,7 +2528,7 @@ async def _assign_device_area_async():
 
             return jsonify({"success": True, "device_id": device_id, "area_id": area_id})
         finally:
-            await ws.disconnect()
+            await release_ws(ws)
 
     except Exception as e:
         logger.error(f"Error assigning device {device_id} to area: {e}")
@@ -1956,12 +2538,7 @@ async def _assign_device_area_async():
 @app.route("/api/rename_entity", methods=["POST"])
 def rename_entity():
     """Directly rename a single entity (entity_id and/or friendly_name)"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_rename_entity_async())
-    finally:
-        loop.close()
+    return run_async(_rename_entity_async())
 
 
 async def _rename_entity_async():
@@ -1972,7 +2549,8 @@ async def _rename_entity_async():
         return jsonify({"error": error}), 400
 
     old_entity_id = sanitize_entity_id(data.get("old_entity_id"))
-    new_entity_id = sanitize_entity_id(data.get("new_entity_id")) if data.get("new_entity_id") else None
+    raw_new_entity_id = data.get("new_entity_id")
+    new_entity_id = sanitize_entity_id(raw_new_entity_id) if raw_new_entity_id else None
     new_friendly_name = sanitize_name(data.get("new_friendly_name"))
 
     if not old_entity_id:
@@ -1982,12 +2560,11 @@ async def _rename_entity_async():
         return jsonify({"error": "new_entity_id or new_friendly_name required"}), 400
 
     try:
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+        base_url = SETTINGS.ha_url
+        token = SETTINGS.ha_token
+        ws_url = SETTINGS.ws_url
 
-        ws = HomeAssistantWebSocket(ws_url, token)
-        await ws.connect()
+        ws = await acquire_ws(ws_url, token)
 
         try:
             entity_registry = EntityRegistry(ws)
@@ -2023,7 +2600,7 @@ async def _rename_entity_async():
                 # Update dependencies (automations, scenes, scripts) if entity ID changed
                 if id_changed:
                     try:
-                        dependency_updater = DependencyUpdater(base_url, token)
+                        dependency_updater = DependencyUpdater(base_url, token, session=await get_http_session())
                         dep_results = await dependency_updater.update_all_dependencies(old_entity_id, new_entity_id)
 
                         # Always include dependency results for debugging
@@ -2062,7 +2639,7 @@ async def _rename_entity_async():
                 return jsonify({"error": "Rename failed"}), 500
 
         finally:
-            await ws.disconnect()
+            await release_ws(ws)
 
     except Exception as e:
         logger.error(f"Error renaming entity {old_entity_id}: {e}")
@@ -2072,12 +2649,7 @@ async def _rename_entity_async():
 @app.route("/api/delete_entity", methods=["POST"])
 def delete_entity():
     """Delete an orphaned entity from the registry."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_delete_entity_async())
-    finally:
-        loop.close()
+    return run_async(_delete_entity_async())
 
 
 async def _delete_entity_async():
@@ -2095,12 +2667,10 @@ async def _delete_entity_async():
     logger.info(f"Deleting entity: {entity_id}")
 
     try:
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+        token = SETTINGS.ha_token
+        ws_url = SETTINGS.ws_url
 
-        ws = HomeAssistantWebSocket(ws_url, token)
-        await ws.connect()
+        ws = await acquire_ws(ws_url, token)
 
         try:
             entity_registry = EntityRegistry(ws)
@@ -2113,7 +2683,7 @@ async def _delete_entity_async():
             })
 
         finally:
-            await ws.disconnect()
+            await release_ws(ws)
 
     except Exception as e:
         logger.error(f"Error deleting entity {entity_id}: {e}")
@@ -2123,13 +2693,7 @@ async def _delete_entity_async():
 @app.route("/api/rename_device", methods=["POST"])
 def rename_device():
     """Benennt ein Gerät in Home Assistant um und aktualisiert Entity-Namen"""
-    # Create new event loop for this request
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_rename_device_async())
-    finally:
-        loop.close()
+    return run_async(_rename_device_async())
 
 
 async def _rename_device_async():
@@ -2154,12 +2718,11 @@ async def _rename_device_async():
 
     try:
         # Erstelle WebSocket Verbindung
-        base_url = os.getenv("HA_URL")
-        token = os.getenv("HA_TOKEN")
-        ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/api/websocket"
+        base_url = SETTINGS.ha_url
+        token = SETTINGS.ha_token
+        ws_url = SETTINGS.ws_url
 
-        ws = HomeAssistantWebSocket(ws_url, token)
-        await ws.connect()
+        ws = await acquire_ws(ws_url, token)
 
         try:
             # Ensure restructurer is loaded
@@ -2193,12 +2756,8 @@ async def _rename_device_async():
             logger.info(f"Old device name: {old_device_name}")
             logger.info(f"New device name: {new_name}")
 
-            entity_registry = EntityRegistry(ws)
-
             # Initialize dependency updater
-            base_url = os.getenv("HA_URL")
-            token = os.getenv("HA_TOKEN")
-            dependency_updater = DependencyUpdater(base_url, token)
+            dependency_updater = DependencyUpdater(base_url, token, session=await get_http_session())
             cached_states = await dependency_updater.get_states()
 
             # Get area name for this device
@@ -2218,14 +2777,13 @@ async def _rename_device_async():
             old_device_display = f"{area_name} {old_device_base}" if area_name else old_device_base
 
             # Count entities for this device
-            device_entities = [eid for eid, einfo in renamer_state["restructurer"].entities.items()
-                               if einfo.get("device_id") == device_id]
+            device_entities = renamer_state["restructurer"].get_device_entity_ids(device_id)
             logger.info(f"Found {len(device_entities)} entities for device {device_id}")
 
-            # Find all entities belonging to this device
-            for old_entity_id, entity_info in list(renamer_state["restructurer"].entities.items()):
-                if entity_info.get("device_id") != device_id:
-                    continue
+            # Work out the new names for all entities belonging to this device
+            targets = []
+            for old_entity_id in device_entities:
+                entity_info = renamer_state["restructurer"].entities[old_entity_id]
 
                 # Get current entity name
                 original_name = entity_info.get("name") or entity_info.get("original_name") or ""
@@ -2267,33 +2825,60 @@ async def _rename_device_async():
                     entities_skipped += 1
                     continue
 
-                try:
-                    # Rename entity (ID + friendly name)
-                    id_changed = new_entity_id != old_entity_id
-                    await entity_registry.rename_entity(
-                        old_entity_id,
-                        new_entity_id if id_changed else None,
-                        new_friendly_name
-                    )
-                    entities_updated += 1
-                    logger.info(f"  SUCCESS: Renamed entity")
+                targets.append((old_entity_id, new_entity_id, new_friendly_name))
 
-                    # Update dependencies if ID changed
-                    if id_changed:
-                        dep_results = await dependency_updater.update_all_dependencies(
-                            old_entity_id, new_entity_id, cached_states
-                        )
-                        dep_count = dep_results.get("total_success", 0)
-                        dependencies_updated += dep_count
-                        if dep_count > 0:
-                            logger.info(f"  Updated {dep_count} dependencies")
-
-                except Exception as e:
-                    entities_failed += 1
-                    logger.error(f"  FAILED: {e}")
+            # Rename the entities concurrently, each task on its own pooled connection
+            dependency_lock = asyncio.Lock()
+            rename_semaphore = asyncio.Semaphore(SETTINGS.rename_concurrency)
 
-            # Reload structure to reflect changes
-            await renamer_state["restructurer"].load_structure(ws)
+            async def _rename_one(old_entity_id, new_entity_id, new_friendly_name):
+                """Rename one entity; returns (renamed, failed, updated dependencies)"""
+                async with rename_semaphore:
+                    entity_ws = None
+                    renamed = False
+                    try:
+                        entity_ws = await acquire_ws(ws_url, token)
+                        # Rename entity (ID + friendly name)
+                        id_changed = new_entity_id != old_entity_id
+                        await EntityRegistry(entity_ws).rename_entity(
+                            old_entity_id,
+                            new_entity_id if id_changed else None,
+                            new_friendly_name
+                        )
+                        renamed = True
+                        logger.info("  SUCCESS: Renamed entity %s", old_entity_id)
+
+                        # Update dependencies if ID changed
+                        dep_count = 0
+                        if id_changed:
+                            # Config updates are read-modify-write; serialize them across tasks
+                            async with dependency_lock:
+                                dep_results = await dependency_updater.update_all_dependencies(
+                                    old_entity_id, new_entity_id, cached_states
+                                )
+                            dep_count = dep_results.get("total_success", 0)
+                            if dep_count > 0:
+                                logger.info("  Updated %s dependencies", dep_count)
+                        return renamed, False, dep_count
+
+                    except Exception as e:
+                        logger.error("  FAILED: %s: %s", old_entity_id, e)
+                        return renamed, True, 0
+                    finally:
+                        if entity_ws is not None:
+                            await release_ws(entity_ws)
+
+            outcomes = await asyncio.gather(*(_rename_one(*target) for target in targets))
+            renamed_targets = []
+            for target, (renamed, failed, dep_count) in zip(targets, outcomes):
+                entities_updated += renamed
+                entities_failed += failed
+                dependencies_updated += dep_count
+                if renamed:
+                    renamed_targets.append(target)
+
+            # Apply the known changes in memory instead of reloading the whole structure
+            renamer_state["restructurer"].apply_device_rename(device_id, new_name, renamed_targets)
 
             logger.info(f"=== Entity rename complete ===")
             logger.info(f"Updated: {entities_updated}, Failed: {entities_failed}, Skipped: {entities_skipped}, Dependencies: {dependencies_updated}")
@@ -2318,7 +2903,7 @@ async def _rename_device_async():
             )
 
         finally:
-            await ws.disconnect()
+            await release_ws(ws)
 
     except Exception as e:
         logger.error(f"Fehler beim Umbenennen des Geräts: {e}")
@@ -2331,16 +2916,16 @@ async def _rename_device_async():
 @app.route("/api/hierarchy")
 def get_hierarchy():
     """Get complete hierarchy data for the 3-panel UI."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(_get_hierarchy_async())
-    finally:
-        loop.close()
+    return run_async(_get_hierarchy_async())
+
 
+# Slug -> words in one pass (entity_id suffix fallback in the hierarchy)
+_UNDERSCORE_TO_SPACE = str.maketrans("_", " ")
 
+
+@lru_cache(maxsize=8192)
 def _strip_prefix(full_name: str, prefix: str) -> str:
-    """Strip a prefix from a name (case-insensitive)."""
+    """Strip a prefix from a name (case-insensitive). Memoized - area/device names rarely change."""
     if not full_name or not prefix:
         return full_name or ""
     full_lower = full_name.lower().strip()
@@ -2353,24 +2938,57 @@ def _strip_prefix(full_name: str, prefix: str) -> str:
     return full_name
 
 
+def hierarchy_etag(restructurer, orphan_entities) -> str:
+    """Digest of everything the hierarchy response is built from.
+
+    Hashing the raw registry data (serialized in C by orjson) is much cheaper
+    than building and sending the per-entity records.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        restructurer.areas,
+        restructurer.devices,
+        restructurer.entities,
+        sorted(orphan_entities),
+        renamer_state["naming_overrides"].data,
+    ):
+        digest.update(json_bytes(part))
+    return digest.hexdigest()
+
+
+def etag_matches(etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag.
+
+    Flask-Compress stores compressed responses under "<etag>:<algorithm>", so a
+    client revalidating such a response sends the suffixed value back.
+    """
+    if_none_match = request.if_none_match
+    if if_none_match.star_tag:
+        return True
+    return any(
+        tag == etag or tag.startswith(etag + ":") for tag in if_none_match.as_set(include_weak=True)
+    )
+
+
 async def _get_hierarchy_async():
     """Async implementation of get_hierarchy."""
     try:
         await load_areas_and_entities()
         restructurer = renamer_state["restructurer"]
 
-        # Build orphan lookup from entities_by_area (where is_orphan is detected)
-        orphan_entities = set()
-        for area_data in renamer_state.get("entities_by_area", {}).values():
-            for domain_entities in area_data.get("domains", {}).values():
-                for e in domain_entities:
-                    if e.get("is_orphan"):
-                        orphan_entities.add(e["entity_id"])
-
-        # Build area lookup for prefix stripping
-        area_names = {}
-        for area_id, area_data in restructurer.areas.items():
-            area_names[area_id] = area_data.get("name", "")
+        # Orphan lookup, collected where load_areas_and_entities detects is_orphan
+        orphan_entities = renamer_state["orphan_entities"]
+
+        # Registry data can change outside this add-on, so the ETag is derived from the
+        # freshly loaded data rather than from a local version counter
+        etag = hierarchy_etag(restructurer, orphan_entities)
+        if etag_matches(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+
+        # Area lookup for prefix stripping (built once per load_structure)
+        area_names = restructurer.area_names
 
         # Build hierarchy response
         areas = []
@@ -2380,9 +2998,11 @@ async def _get_hierarchy_async():
                 "name": area_data.get("name", ""),
             })
 
-        # Build device lookup with base names (strip area prefix)
+        # Build device lookup with base names (strip area prefix), full display
+        # names (area + device base) and their slugs, once per device
         device_base_names = {}
-        device_area_map = {}
+        device_display_names = {}
+        device_slug_prefixes = {}
         devices = []
         for device_id, device_data in restructurer.devices.items():
             raw_name = device_data.get("name_by_user") or device_data.get("name", "")
@@ -2395,20 +3015,15 @@ async def _get_hierarchy_async():
                 base_name = _strip_prefix(raw_name, area_names[area_id])
 
             device_base_names[device_id] = base_name
-            device_area_map[device_id] = area_id
-
-            # Extract integration(s) from identifiers
-            # identifiers is like [["homekit_controller", "xxx"], ["zha", "yyy"]]
-            # Some have format like "homekit_controller:accessory-id" - we only want the domain part
-            integrations = []
-            for identifier in device_data.get("identifiers", []):
-                if isinstance(identifier, (list, tuple)) and len(identifier) >= 1:
-                    domain = identifier[0]
-                    # Strip anything after colon (e.g., "homekit_controller:accessory-id" -> "homekit_controller")
-                    if ":" in domain:
-                        domain = domain.split(":")[0]
-                    if domain and domain not in integrations:
-                        integrations.append(domain)
+            if area_id and area_id in area_names:
+                device_display = f"{area_names[area_id]} {base_name}"
+            else:
+                device_display = base_name
+            device_display_names[device_id] = device_display
+            device_slug_prefixes[device_id] = device_display.lower().replace(" ", "_")
+
+            # Integration(s) from identifiers (extracted once per load_structure)
+            integrations = restructurer.device_integrations.get(device_id, [])
 
             devices.append({
                 "id": device_id,
@@ -2421,10 +3036,13 @@ async def _get_hierarchy_async():
                 "disabled_by": device_data.get("disabled_by"),
             })
 
-        entities = []
-        for entity_id, entity_data in restructurer.entities.items():
+        area_slug_prefixes = {aid: name.lower().replace(" ", "_") for aid, name in area_names.items()}
+        get_override = renamer_state["naming_overrides"].get_entity_override
+
+        def _entity_record(entity_id, entity_data):
+            """Build one entity's hierarchy record; keys without a value are left out"""
             registry_id = entity_data.get("id", "")
-            override = renamer_state["naming_overrides"].get_entity_override(registry_id)
+            override = get_override(registry_id)
             device_class = entity_data.get("device_class") or entity_data.get("original_device_class")
             device_id = entity_data.get("device_id")
             area_id = entity_data.get("area_id")
@@ -2432,56 +3050,39 @@ async def _get_hierarchy_async():
             # Get original friendly name
             original_name = entity_data.get("name") or entity_data.get("original_name") or ""
 
-            # Debug logging for specific entities
-            if "wallbox" in entity_id.lower():
-                logger.info(f"DEBUG {entity_id}: name={entity_data.get('name')!r}, original_name={entity_data.get('original_name')!r}, computed={original_name!r}")
-
             # Strip device+area prefix from entity name
             # e.g., "Büro Raumluftsensor Kohlendioxid" -> "Kohlendioxid"
             base_name = original_name
             if device_id and device_id in device_base_names:
-                # Build full device display name (area + device base)
-                dev_area_id = device_area_map.get(device_id)
-                dev_base = device_base_names[device_id]
-                if dev_area_id and dev_area_id in area_names:
-                    device_display = f"{area_names[dev_area_id]} {dev_base}"
-                else:
-                    device_display = dev_base
-                base_name = _strip_prefix(original_name, device_display)
+                base_name = _strip_prefix(original_name, device_display_names[device_id])
                 # Also try just device base name
                 if base_name == original_name:
-                    base_name = _strip_prefix(original_name, dev_base)
+                    base_name = _strip_prefix(original_name, device_base_names[device_id])
             elif area_id and area_id in area_names:
                 base_name = _strip_prefix(original_name, area_names[area_id])
 
             # Fallback: If base_name is still empty or equals domain, try extracting from entity_id
-            domain = entity_id.split(".")[0] if "." in entity_id else ""
-            if not base_name or base_name.lower() == domain:
+            # (base_name equals the domain exactly when entity_id starts with "<base_name>.",
+            # so the ID is only split for entities that take this branch)
+            if not base_name or (
+                "." not in (base_lower := base_name.lower()) and entity_id.startswith(base_lower + ".")
+            ):
+                _, separator, entity_slug = entity_id.partition(".")
+                if not separator:
+                    entity_slug = entity_id
                 # Try to extract suffix from entity_id
                 # e.g., sensor.tiefgarage_wallbox_angebotene_leistung -> angebotene_leistung
-                entity_slug = entity_id.split(".")[-1] if "." in entity_id else entity_id
-                # Build expected prefix from device/area
-                expected_prefix = ""
-                if device_id and device_id in device_base_names:
-                    dev_area_id = device_area_map.get(device_id)
-                    dev_base = device_base_names[device_id]
-                    if dev_area_id and dev_area_id in area_names:
-                        expected_prefix = f"{area_names[dev_area_id]}_{dev_base}".lower().replace(" ", "_")
-                    else:
-                        expected_prefix = dev_base.lower().replace(" ", "_")
-                elif area_id and area_id in area_names:
-                    expected_prefix = area_names[area_id].lower().replace(" ", "_")
+                # Expected prefix from the precomputed device/area slugs
+                if device_id in device_slug_prefixes:
+                    expected_prefix = device_slug_prefixes[device_id]
+                else:
+                    expected_prefix = area_slug_prefixes.get(area_id, "")
 
                 if expected_prefix and entity_slug.startswith(expected_prefix + "_"):
-                    suffix_slug = entity_slug[len(expected_prefix) + 1:]
                     # Convert slug to human-readable: replace underscores with spaces, title case
-                    base_name = suffix_slug.replace("_", " ").title()
-
-            # Debug logging for wallbox entities
-            if "wallbox" in entity_id.lower():
-                logger.info(f"DEBUG {entity_id}: base_name={base_name!r}, device_id={device_id}, has_device={device_id in device_base_names if device_id else False}")
+                    base_name = entity_slug[len(expected_prefix) + 1:].translate(_UNDERSCORE_TO_SPACE).title()
 
-            entities.append({
+            record = {
                 "id": entity_id,
                 "registry_id": registry_id,
                 "device_id": device_id,
@@ -2495,9 +3096,13 @@ async def _get_hierarchy_async():
                 "labels": entity_data.get("labels", []),
                 "platform": entity_data.get("platform"),  # Integration that provides this entity
                 "is_orphan": entity_id in orphan_entities,  # Entity restored but not provided by integration
-            })
+            }
+            return {key: value for key, value in record.items() if value is not None}
 
-        return jsonify({
+        # Built before the response starts, so a failing record still ends up in the 500 below
+        entities = [_entity_record(entity_id, entity_data) for entity_id, entity_data in restructurer.entities.items()]
+
+        response = stream_json_response({
             "areas": areas,
             "devices": devices,
             "entities": entities,
@@ -2507,12 +3112,23 @@ async def _get_hierarchy_async():
                 "entity_count": len(entities),
             }
         })
+        response.set_etag(etag)
+        # Browsers revalidate with If-None-Match on every load and reuse the body on 304
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
     except Exception as e:
         logger.error(f"Error getting hierarchy: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+# language -> (user mappings it was built from, serialized response body)
+_type_mappings_responses: Dict[str, Tuple[object, bytes]] = {}
+
+# Languages kept in _type_mappings_responses (lang comes from the query string)
+TYPE_MAPPINGS_RESPONSE_LIMIT = 8
+
+
 @app.route("/api/type_mappings")
 def get_type_mappings():
     """Get all type mappings (system defaults and user overrides)."""
@@ -2520,25 +3136,36 @@ def get_type_mappings():
         language = request.args.get("lang", "en")
         type_mappings = renamer_state["type_mappings"]
 
-        raw_mappings = type_mappings.get_all_known_types(language)
+        # User mappings are copy-on-write: any set/remove/reload swaps in a new object,
+        # so an identity check tells whether the cached body is still current
+        user_mappings = type_mappings.user_mappings
+        cached = _type_mappings_responses.get(language)
+        if cached is not None and cached[0] is user_mappings:
+            return json_bytes_response(cached[1])
+
+        raw_mappings = type_mappings.iter_known_types(language)
 
         # Transform to frontend-expected format
-        all_mappings = []
-        for m in raw_mappings:
-            has_user = m.get("user_mapping") is not None
-            all_mappings.append({
-                "key": m["key"],
-                "system_default": m.get("system_default"),
-                "effective_value": m.get("user_mapping") or m.get("system_default") or m["key"].title(),
-                "has_user_override": has_user,
+        all_mappings = [
+            {
+                "key": (key := m["key"]),
+                "system_default": (system_default := m.get("system_default")),
+                "effective_value": (user_mapping := m.get("user_mapping")) or system_default or key.title(),
+                "has_user_override": user_mapping is not None,
                 "source": m.get("source", "unknown"),
-            })
+            }
+            for m in raw_mappings
+        ]
 
-        return jsonify({
+        body = json_bytes({
             "mappings": all_mappings,
             "language": language,
-            "user_mapping_count": len(type_mappings.get_all_user_mappings()),
+            "user_mapping_count": len(user_mappings),
         })
+        if len(_type_mappings_responses) >= TYPE_MAPPINGS_RESPONSE_LIMIT:
+            _type_mappings_responses.clear()
+        _type_mappings_responses[language] = (user_mappings, body)
+        return json_bytes_response(body)
 
     except Exception as e:
         logger.error(f"Error getting type mappings: {e}")
@@ -2633,7 +3260,7 @@ def learn_type_mapping():
 @app.route("/settings")
 def settings_page():
     """Render the settings page for type mappings management."""
-    version = str(int(time.time()))
+    version = ASSET_VERSION
     response = make_response(render_template("settings.html", version=version))
     # Prevent browser from caching the HTML page
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
@@ -2651,5 +3278,9 @@ if __name__ == "__main__":
     print("\nALPHA VERSION - Entity Manager Add-on")
     print(f"\nStarting Web UI on port {port}\n")
 
-    # Run without debug in production
-    app.run(debug=False, host="0.0.0.0", port=port)
+    if serve is not None:
+        # Multi-threaded production server; async work still runs on the shared event loop
+        serve(app, host="0.0.0.0", port=port, threads=8)
+    else:
+        # Run without debug in production
+        app.run(debug=False, host="0.0.0.0", port=port)